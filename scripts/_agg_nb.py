@@ -0,0 +1,117 @@
+"""Summary-statistic kernels for the analysis scripts.
+
+The kernels are NumPy reductions by default. With USE_NUMBA=1 and numba
+installed they are compiled to native loops instead, and cache=True keeps the
+compiled code on disk between runs; callers never check which one they got.
+Inputs are contiguous float64 arrays.
+
+box_stats, shared by the latency boxplots, is plain NumPy either way.
+"""
+
+import os
+
+import numpy as np
+
+# Opt-in: importing numba and the first-run JIT cost more than the loops save at these sample counts
+numba = None
+if os.environ.get("USE_NUMBA") == "1":
+    try:
+        import numba
+    except ImportError:  # optional: pure NumPy below
+        pass
+
+# Outliers drawn per latency box; beyond this they are thinned rather than all rendered
+MAX_FLIERS = 200
+
+
+def _agg_stats_np(arr):
+    """Return (mean, median, min, max, sample stdev) of a non-empty float64 array."""
+    std = arr.std(ddof=1) if arr.size > 1 else 0.0
+    return arr.mean(), np.median(arr), arr.min(), arr.max(), std
+
+
+def _agg_per_conc_np(flat, offsets):
+    """Return per-group (means, sample stdevs) of a ragged array.
+
+    flat holds every group's values back to back; group g spans
+    flat[offsets[g]:offsets[g + 1]]. Every group must be non-empty.
+    """
+    starts = offsets[:-1]
+    counts = np.diff(offsets)
+    means = np.add.reduceat(flat, starts) / counts
+    sq_dev = np.add.reduceat((flat - np.repeat(means, counts)) ** 2, starts)
+    stds = np.where(counts > 1, np.sqrt(sq_dev / np.maximum(counts - 1, 1)), 0.0)
+    return means, stds
+
+
+if numba is None:
+    agg_stats = _agg_stats_np
+    agg_per_conc = _agg_per_conc_np
+else:
+    # Same contracts as the NumPy versions above, as explicit loops for numba
+
+    @numba.njit(cache=True, fastmath=True)
+    def agg_stats(arr):
+        n = arr.size
+        lo = arr[0]
+        hi = arr[0]
+        total = 0.0
+        for x in arr:
+            total += x
+            if x < lo:
+                lo = x
+            if x > hi:
+                hi = x
+        mean = total / n
+        sq_dev = 0.0
+        for x in arr:
+            sq_dev += (x - mean) * (x - mean)
+        std = np.sqrt(sq_dev / (n - 1)) if n > 1 else 0.0
+        return mean, np.median(arr), lo, hi, std
+
+    @numba.njit(cache=True, fastmath=True)
+    def agg_per_conc(flat, offsets):
+        n_groups = offsets.size - 1
+        means = np.empty(n_groups)
+        stds = np.empty(n_groups)
+        for g in range(n_groups):
+            start = offsets[g]
+            end = offsets[g + 1]
+            count = end - start
+            total = 0.0
+            for i in range(start, end):
+                total += flat[i]
+            mean = total / count
+            sq_dev = 0.0
+            for i in range(start, end):
+                sq_dev += (flat[i] - mean) * (flat[i] - mean)
+            means[g] = mean
+            stds[g] = np.sqrt(sq_dev / (count - 1)) if count > 1 else 0.0
+        return means, stds
+
+
+def box_stats(values, label=None):
+    """Precompute boxplot stats for ax.bxp so matplotlib never sees the raw samples.
+
+    Whiskers follow plt.boxplot's 1.5 * IQR rule; at most MAX_FLIERS outliers,
+    evenly spaced through the sorted fliers (extremes included), are kept.
+    """
+    arr = np.asarray(values, dtype=np.float64)
+    q1, med, q3 = np.percentile(arr, [25, 50, 75])
+    iqr = q3 - q1
+    lo, hi = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    inside = arr[(arr >= lo) & (arr <= hi)]
+    fliers = arr[(arr < lo) | (arr > hi)]
+    if fliers.size > MAX_FLIERS:
+        fliers = np.sort(fliers)[np.linspace(0, fliers.size - 1, MAX_FLIERS).astype(np.intp)]
+    stats = {
+        "med": med,
+        "q1": q1,
+        "q3": q3,
+        "whislo": min(inside.min(), q1) if inside.size else q1,
+        "whishi": max(inside.max(), q3) if inside.size else q3,
+        "fliers": fliers,
+    }
+    if label is not None:
+        stats["label"] = label
+    return stats
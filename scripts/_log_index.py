@@ -0,0 +1,94 @@
+"""Shared index of the *_run.log files under results/raw.
+
+The first lookup walks results/raw once with os.scandir and records each
+directory's run logs together with the directory's mtime. The index is
+pickled next to the other parse caches, so later scripts and later runs
+skip the walk. A directory whose mtime changed (a log was added, removed
+or renamed) is rescanned on its own.
+
+Lookups are thread-safe: generate_summary.py loads directories on a
+thread pool, and every lookup may rescan and save the shared index.
+"""
+
+import os
+import pickle
+import threading
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+RAW_DIR = ROOT_DIR / "results" / "raw"
+INDEX_CACHE = ROOT_DIR / "results" / "processed" / ".log_index_cache.pkl"
+
+RUN_LOG_SUFFIX = "_run.log"
+
+# {directory path: (mtime_ns, sorted run log paths)}, loaded on first lookup
+_index = None
+# Guards _index and INDEX_CACHE across threads
+_index_lock = threading.Lock()
+
+
+def _scan(dir_path, index):
+    """Record dir_path's run logs in index and return its subdirectory paths."""
+    mtime_ns = os.stat(dir_path).st_mtime_ns  # taken first so a concurrent write forces a rescan
+    logs = []
+    subdirs = []
+    with os.scandir(dir_path) as it:
+        for e in it:
+            if e.is_dir():
+                subdirs.append(e.path)
+            elif e.name.endswith(RUN_LOG_SUFFIX) and e.is_file():
+                logs.append(e.path)
+    logs.sort()  # same directory, so this is name order
+    index[dir_path] = (mtime_ns, logs)
+    return subdirs
+
+
+def _build_index():
+    index = {}
+    pending = [str(RAW_DIR)]
+    while pending:
+        try:
+            pending.extend(_scan(pending.pop(), index))
+        except FileNotFoundError:
+            pass
+    return index
+
+
+def _load_index():
+    try:
+        with INDEX_CACHE.open("rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def _save_index(index):
+    INDEX_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = INDEX_CACHE.with_name(f"{INDEX_CACHE.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, INDEX_CACHE)  # other processes never see a partly written index
+
+
+def list_run_logs(dir_path):
+    """Return the paths (as str) of the *_run.log files in dir_path, sorted by name."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = _load_index()
+            if _index is None:
+                _index = _build_index()
+                _save_index(_index)
+
+        key = str(dir_path)
+        entry = _index.get(key)
+        try:
+            if entry is None or entry[0] != os.stat(key).st_mtime_ns:
+                _scan(key, _index)
+                _save_index(_index)
+                entry = _index[key]
+        except FileNotFoundError:
+            if _index.pop(key, None) is not None:
+                _save_index(_index)
+            return []
+        return list(entry[1])
@@ -0,0 +1,211 @@
+"""Run-log parsers shared by the analysis scripts.
+
+The patterns are compiled once per interpreter, however many of the scripts
+import them (analyze_all.py runs several in one process). The parse
+functions are module-level so process pools can pickle them by name.
+
+load_parsed runs a parser over a directory's run logs and caches the
+results per log directory, so scripts reading the same logs with the same
+parser share one parse.
+"""
+
+import array
+import hashlib
+import mmap
+import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from _log_index import RAW_DIR, ROOT_DIR, list_run_logs
+
+# One pickle per log directory:
+#   {"version": PARSER_VERSION, "parsed": {parser name: {log path: (mtime_ns, size, parsed result)}}}
+PARSE_CACHE_DIR = ROOT_DIR / "results" / "processed" / ".parse_cache"
+
+# Hash of this module's source; editing a pattern or parser invalidates every cached parse
+PARSER_VERSION = hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+
+# Below this many logs to parse, process-pool startup costs more than parsing serially
+PARALLEL_MIN_LOGS = 4
+
+RUN_LOG_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2}Z)_run\.log$")
+
+# Bytes patterns run with findall over the whole mapped log; only captured numbers are decoded.
+# Fields are separated by [ \t]+ rather than \s+, which would also match a newline and let one
+# match pair fields from adjacent lines.
+COLD_START_PATTERN = re.compile(rb"cold_start_ms=(\d+\.?\d*)")
+LATENCY_PATTERN = re.compile(rb"req=\d+[ \t]+http_code=(\d{3})[ \t]+latency_ns=\d+[ \t]+latency_ms=(\d+\.?\d*)")
+RESOURCE_PATTERN = re.compile(rb"rss_kb=(\d+)[ \t]+cpu_pct=([0-9.]+)")
+THROUGHPUT_PATTERN = re.compile(rb"throughput_rps=([0-9.]+)")
+SCALE_LINE_PATTERN = re.compile(
+    rb"run=\d+[ \t]+conc=(\d+)[ \t]+total_requests=\d+[ \t]+elapsed_ms=[0-9.]+[ \t]+"
+    rb"throughput_rps=([0-9.]+).*total_rss_kb=(\d+).*avg_rss_kb=(\d+)"
+)
+# Latency lines with an optional path field
+STATEFUL_LATENCY_PATTERN = re.compile(rb"req=\d+(?:[ \t]+path=(\S+))?[ \t].*?latency_ms=([0-9.]+)")
+OUTER_MS_PATTERN = re.compile(rb"outer_ms=([0-9.]+)")
+# [^\n]* keeps each match within one line
+CPU_SCALE_LINE_PATTERN = re.compile(rb"conc=(\d+)[^\n]*throughput_iter_s=([0-9.]+)")
+
+
+def runtime_dirs(subdir, runtimes):
+    """Return {runtime: results/raw/<runtime>/<subdir>} for each named runtime."""
+    return {rt: RAW_DIR / rt / subdir for rt in runtimes}
+
+
+@contextmanager
+def map_log(path):
+    """Map a log file read-only so patterns scan it in one C-level pass.
+
+    Empty files cannot be mapped and yield b"" instead.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield buf
+
+
+def parse_run_log(path: str):
+    """
+    Parse a single http-hello *_run.log file.
+
+    Returns None if the file name carries no run id, otherwise:
+        {
+            "run_id": str,
+            "cold_start_ms": float or None,
+            "latencies_ms": np.ndarray (float64, HTTP 200 responses only),
+            "rss_kb": int or None,
+            "cpu_pct": float or None,
+            "throughput_rps": float or None,
+        }
+
+    Callers decide what to do with runs missing a cold start or latencies.
+    """
+    m = RUN_LOG_PATTERN.search(os.path.basename(path))
+    if not m:
+        return None
+    run_id = m.group(1)
+
+    with map_log(path) as buf:
+        cold_starts = COLD_START_PATTERN.findall(buf)
+        latencies_ms = np.fromiter(
+            (float(lat) for code, lat in LATENCY_PATTERN.findall(buf) if code == b"200"), dtype=np.float64
+        )
+        resources = RESOURCE_PATTERN.findall(buf)
+        throughputs = THROUGHPUT_PATTERN.findall(buf)
+
+    # Later lines win, as they did when parsing line by line
+    rss_kb, cpu_pct = (int(resources[-1][0]), float(resources[-1][1])) if resources else (None, None)
+
+    return {
+        "run_id": run_id,
+        "cold_start_ms": float(cold_starts[-1]) if cold_starts else None,
+        "latencies_ms": latencies_ms,
+        "rss_kb": rss_kb,
+        "cpu_pct": cpu_pct,
+        "throughput_rps": float(throughputs[-1]) if throughputs else None,
+    }
+
+
+def parse_scaling_log(path: str):
+    """Return (conc, throughput_rps, total_rss_kb, avg_rss_kb) for each scaling line in one run log."""
+    with map_log(path) as buf:
+        matches = SCALE_LINE_PATTERN.findall(buf)
+    return [
+        (int(conc), float(throughput_rps), int(total_rss_kb), int(avg_rss_kb))
+        for conc, throughput_rps, total_rss_kb, avg_rss_kb in matches
+    ]
+
+
+def parse_stateful_log(path: str):
+    """Return (endpoint path, latency_ms) for each request line in one run log."""
+    with map_log(path) as buf:
+        matches = STATEFUL_LATENCY_PATTERN.findall(buf)
+    # default to / if no path specified
+    return [(p.decode() if p else "/", float(latency_ms)) for p, latency_ms in matches]
+
+
+def parse_outer_ms_log(path: str):
+    """Return the cpu-hash outer_ms samples recorded in one run log."""
+    with map_log(path) as buf:
+        return array.array("d", map(float, OUTER_MS_PATTERN.findall(buf)))
+
+
+def parse_cpu_scaling_log(path: str):
+    """Return the cpu-hash (conc, throughput) pairs recorded in one run log."""
+    with map_log(path) as buf:
+        matches = CPU_SCALE_LINE_PATTERN.findall(buf)
+    return [(int(conc), float(tp)) for conc, tp in matches]
+
+
+def parse_logs(logs, parse_fn):
+    """Apply parse_fn to independent run logs, fanning out to a process pool when there are enough of them."""
+    if len(logs) < PARALLEL_MIN_LOGS:
+        return [parse_fn(log) for log in logs]
+    with ProcessPoolExecutor() as ex:
+        return list(ex.map(parse_fn, logs))
+
+
+def _cache_path(dir_path):
+    try:
+        name = Path(dir_path).resolve().relative_to(RAW_DIR).as_posix().replace("/", "__")
+    except ValueError:  # outside results/raw
+        name = hashlib.sha1(str(dir_path).encode()).hexdigest()
+    return PARSE_CACHE_DIR / f"{name}.pkl"
+
+
+def _load_cache(path):
+    """Return the cached {parser name: entries} map, or {} if missing, unreadable or from other parsers."""
+    try:
+        with path.open("rb") as f:
+            cache = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != PARSER_VERSION:
+        return {}
+    return cache["parsed"]
+
+
+def _save_cache(path, cache):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        pickle.dump({"version": PARSER_VERSION, "parsed": cache}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)  # readers never see a partly written cache
+
+
+def load_parsed(dir_path, parse_fn):
+    """Return (log path, parse_fn(log path)) for each run log in dir_path, in name order.
+
+    A log is reparsed only when its mtime or size changed since it was cached,
+    or when _log_parsers.py itself changed.
+    """
+    logs = list_run_logs(dir_path)
+    cache_path = _cache_path(dir_path)
+    cache = _load_cache(cache_path)
+    cached = cache.get(parse_fn.__name__, {})
+
+    entries = {}
+    stale = {}
+    for log in logs:
+        st = os.stat(log)
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = cached.get(log)
+        if entry is None or entry[:2] != stamp:
+            stale[log] = stamp
+        else:
+            entries[log] = entry
+    for log, parsed in zip(stale, parse_logs(list(stale), parse_fn)):
+        entries[log] = (*stale[log], parsed)
+
+    if stale or len(entries) != len(cached):  # parsed or removed logs
+        cache[parse_fn.__name__] = entries
+        _save_cache(cache_path, cache)
+    return [(log, entries[log][2]) for log in logs]
@@ -0,0 +1,20 @@
+"""Plot settings shared by the analysis scripts."""
+
+import os
+
+# Default 100 dpi is plenty for charts viewed in markdown; set PLOT_DPI=300 for publication figures
+PLOT_DPI = int(os.environ.get("PLOT_DPI", 100))
+
+
+def load_pyplot():
+    """Import pyplot on first use so runs that find no data skip the matplotlib import."""
+    import matplotlib
+
+    matplotlib.use("Agg")  # PNG output only; skip interactive backend selection
+    import matplotlib.pyplot as plt
+
+    # Cheaper Agg path rendering for line-heavy plots
+    matplotlib.rcParams["path.simplify"] = True
+    matplotlib.rcParams["path.simplify_threshold"] = 1.0
+    matplotlib.rcParams["agg.path.chunksize"] = 10000
+    return plt
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Run the hello-world analyses in a single interpreter.
+
+matplotlib, NumPy and the shared run-log index are imported once instead of
+once per script, so this replaces invoking each analyze_*.py below in turn:
+
+    python3 scripts/analyze_all.py
+"""
+
+import importlib
+import sys
+import traceback
+
+ANALYSES = [
+    "analyze_native_http_hello",
+    "analyze_http_hello_all",
+    "analyze_http_hello_stateful",
+    "analyze_http_hello_scaling",
+    "analyze_wasm_hello_comparison",
+]
+
+
+def run_analysis(name):
+    """Run one analysis's main() and return None on success, else a short reason.
+
+    Every analysis's main() returns 1 when it finds no usable data, including
+    those that still exit 0 when run directly. A SystemExit or an exception
+    is reported too, so one broken analysis does not stop the rest.
+    """
+    try:
+        rc = importlib.import_module(name).main()
+    except SystemExit as e:
+        rc = e.code
+    except Exception:
+        traceback.print_exc()
+        return "raised an exception"
+    if rc:
+        return "no usable data" if rc == 1 else f"exit status {rc}"
+    return None
+
+
+def main():
+    failed = []
+    for name in ANALYSES:
+        print(f"\n##### {name} #####")
+        reason = run_analysis(name)
+        if reason:
+            failed.append(f"{name} ({reason})")
+
+    if failed:
+        print(f"\n[WARN] Analyses failed: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
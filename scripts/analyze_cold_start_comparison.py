@@ -13,14 +13,15 @@ Usage:
     python3 scripts/analyze_cold_start_comparison.py
 """
 
-import csv
-import statistics
+import hashlib
+import os
+import pickle
 from pathlib import Path
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 import numpy as np
 
+from _plotting import PLOT_DPI, load_pyplot
+
 ROOT_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT_DIR / "results" / "raw" / "cold-start-comparison"
 OUT_DIR = ROOT_DIR / "results" / "processed"
@@ -28,55 +29,181 @@ OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 CSV_FILE = DATA_DIR / "cold_start_data.csv"
 
+# CSV schema: runtime,type,run,build_ms,start_ms,total_ms
+CSV_FIELDS = 6
+COLUMNS = ("run", "build_ms", "start_ms", "total_ms")
+SCENARIOS = ("docker_full_cold", "docker_runtime_cold", "wasmtime_full_cold", "wasmtime_runtime_cold")
+
+# Parse checkpoint: CSV stamp, byte offset of the last complete row, the bytes
+# just before it (to detect rewrites) and the columns parsed so far.
+CSV_STATE = OUT_DIR / ".cold_start_cache.pkl"
+STATE_TAIL_BYTES = 256
+
+
+def load_state():
+    """Load the parse checkpoint, or None if it is missing or unreadable."""
+    try:
+        with CSV_STATE.open("rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def save_state(state):
+    """Persist the parse checkpoint."""
+    with CSV_STATE.open("wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def append_row(columns, line):
+    """Append one raw CSV line to its scenario's column lists, skipping malformed rows."""
+    parts = line.rstrip().split(b",")
+    if len(parts) != CSV_FIELDS:
+        return
+    cols = columns.get(parts[0] + b"_" + parts[1])
+    if cols is None:
+        return
+    runs, build, start, total = cols
+    runs.append(int(parts[2]))
+    build.append(float(parts[3]))
+    start.append(float(parts[4]))
+    total.append(float(parts[5]))
+
 
 def load_data():
-    """Load cold start data from CSV."""
+    """Load cold start data from CSV.
+
+    Returns a dict mapping "<runtime>_<type>" to a dict of parallel arrays
+    (structure-of-arrays): "run" (int32) plus "build_ms", "start_ms" and
+    "total_ms" (float64).
+    """
     if not CSV_FILE.exists():
         print(f"ERROR: Data file not found: {CSV_FILE}")
         print("Run the measurement script first:")
         print("  ./scripts/measure_cold_start_comparison.sh")
         return None
 
-    data = {
-        "docker_full_cold": [],
-        "docker_runtime_cold": [],
-        "wasmtime_full_cold": [],
-        "wasmtime_runtime_cold": [],
-    }
+    st = CSV_FILE.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    state = load_state()
+
+    # The checkpoint alone is complete only if it covers the whole file; an
+    # unterminated last row is never checkpointed and is re-read below
+    if state is not None and state["stamp"] == stamp and state["offset"] == st.st_size:
+        columns = state["columns"]
+    else:
+        with open(CSV_FILE, "rb") as f:
+            columns = None
+            # Resume after the last parsed row if the file was only appended to
+            if state is not None and 0 < state["offset"] <= st.st_size:
+                tail = state["tail"]
+                f.seek(state["offset"] - len(tail))
+                if f.read(len(tail)) == tail:
+                    columns, offset = state["columns"], state["offset"]
+            if columns is None:
+                f.seek(0)
+                # Columnar run/build/start/total lists per scenario, keyed by the raw CSV bytes
+                columns = {key.encode(): ([], [], [], []) for key in SCENARIOS}
+                offset = len(f.readline())  # header
+
+            pending = None
+            for line in f:
+                if not line.endswith(b"\n"):
+                    pending = line  # possibly still being written; not checkpointed
+                    break
+                offset += len(line)
+                append_row(columns, line)
+
+            f.seek(max(0, offset - STATE_TAIL_BYTES))
+            tail = f.read(offset - f.tell())
+
+        save_state({"stamp": stamp, "offset": offset, "tail": tail, "columns": columns})
+        if pending is not None:
+            append_row(columns, pending)
 
-    with open(CSV_FILE, "r") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            runtime = row["runtime"]
-            start_type = row["type"]
-            key = f"{runtime}_{start_type}"
+    return {
+        key.decode(): {
+            "run": np.asarray(runs, dtype=np.int32),
+            "build_ms": np.asarray(build, dtype=np.float64),
+            "start_ms": np.asarray(start, dtype=np.float64),
+            "total_ms": np.asarray(total, dtype=np.float64),
+        }
+        for key, (runs, build, start, total) in columns.items()
+    }
 
-            if key in data:
-                entry = {
-                    "run": int(row["run"]),
-                    "build_ms": float(row["build_ms"]),
-                    "start_ms": float(row["start_ms"]),
-                    "total_ms": float(row["total_ms"]),
-                }
-                data[key].append(entry)
 
-    return data
+def data_digest(data):
+    """Fingerprint the loaded data (and this script and PLOT_DPI) so unchanged plots can be skipped."""
+    h = hashlib.sha1(Path(__file__).read_bytes())
+    h.update(f"dpi={PLOT_DPI}".encode())
+    for key in sorted(data):
+        h.update(key.encode())
+        for col in COLUMNS:
+            h.update(data[key][col].tobytes())
+    return h.hexdigest()
+
+
+def plot_is_cached(out_path, digest):
+    """True if out_path exists and was rendered from data with this digest.
+
+    A cached plot's mtime is bumped as if it had been saved again, so
+    run_all_benchmarks.sh still copies it into the per-run plot archive.
+    """
+    sidecar = out_path.with_name(out_path.name + ".sha1")
+    try:
+        if not (out_path.exists() and sidecar.read_text().strip() == digest):
+            return False
+        os.utime(out_path)
+    except OSError:
+        return False
+    return True
+
+
+def new_axes(fig, figsize):
+    """Clear the shared figure, resize it and return a fresh Axes."""
+    fig.clf()
+    fig.set_size_inches(*figsize)
+    return fig.add_subplot()
+
+
+def save_plot(fig, out_path, digest):
+    """Save the figure and record the digest it was rendered from."""
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=PLOT_DPI, bbox_inches="tight")
+    out_path.with_name(out_path.name + ".sha1").write_text(digest + "\n")
+    print(f"Saved: {out_path}")
 
 
 def compute_stats(values):
     """Compute statistics for a list of values."""
-    if not values:
+    a = np.asarray(values, dtype=np.float64)
+    if a.size == 0:
         return {}
     return {
-        "mean": statistics.mean(values),
-        "median": statistics.median(values),
-        "stdev": statistics.stdev(values) if len(values) > 1 else 0,
-        "min": min(values),
-        "max": max(values),
-        "count": len(values),
+        "mean": a.mean(),
+        "median": np.median(a),
+        "stdev": a.std(ddof=1) if a.size > 1 else 0,
+        "min": a.min(),
+        "max": a.max(),
+        "count": a.size,
     }
 
 
+def compute_plot_stats(data):
+    """Per-scenario aggregates shared by the plot functions (zeros for empty scenarios)."""
+    stats = {}
+    for key, cols in data.items():
+        n = cols["total_ms"].size
+        stats[key] = {
+            "count": n,
+            "mean": cols["total_ms"].mean() if n else 0,
+            "std": cols["total_ms"].std(ddof=1) if n > 1 else 0,
+            "build_mean": cols["build_ms"].mean() if n else 0,
+            "start_mean": cols["start_ms"].mean() if n else 0,
+        }
+    return stats
+
+
 def print_summary(data):
     """Print text summary of results."""
     print("\n" + "=" * 70)
@@ -90,13 +217,16 @@ def print_summary(data):
         "wasmtime_runtime_cold": "Wasmtime (Runtime Cold - pre-built component)",
     }
 
+    # Mean total time per non-empty scenario, reused by the comparisons below
+    means = {}
+
     for key in ["docker_full_cold", "docker_runtime_cold", "wasmtime_full_cold", "wasmtime_runtime_cold"]:
-        entries = data.get(key, [])
-        if not entries:
+        cols = data[key]
+        if cols["total_ms"].size == 0:
             continue
 
-        total_times = [e["total_ms"] for e in entries]
-        stats = compute_stats(total_times)
+        stats = compute_stats(cols["total_ms"])
+        means[key] = stats["mean"]
 
         print(f"\n{labels[key]}:")
         print(f"  Total time to first HTTP 200:")
@@ -107,11 +237,9 @@ def print_summary(data):
         print(f"    Max:    {stats['max']:>10.2f} ms")
 
         if "full_cold" in key:
-            build_times = [e["build_ms"] for e in entries]
-            start_times = [e["start_ms"] for e in entries]
             print(f"  Breakdown:")
-            print(f"    Build:  {statistics.mean(build_times):>10.2f} ms (mean)")
-            print(f"    Start:  {statistics.mean(start_times):>10.2f} ms (mean)")
+            print(f"    Build:  {cols['build_ms'].mean():>10.2f} ms (mean)")
+            print(f"    Start:  {cols['start_ms'].mean():>10.2f} ms (mean)")
 
     # Comparisons
     print("\n" + "-" * 70)
@@ -125,9 +253,9 @@ def print_summary(data):
     ]
 
     for key1, key2, desc in comparisons:
-        if data.get(key1) and data.get(key2):
-            mean1 = statistics.mean([e["total_ms"] for e in data[key1]])
-            mean2 = statistics.mean([e["total_ms"] for e in data[key2]])
+        if key1 in means and key2 in means:
+            mean1 = means[key1]
+            mean2 = means[key2]
 
             if mean1 > mean2:
                 ratio = mean1 / mean2
@@ -141,9 +269,14 @@ def print_summary(data):
     print("=" * 70 + "\n")
 
 
-def plot_grouped_bar(data):
+def plot_grouped_bar(fig, stats, digest):
     """Create grouped bar chart comparing all 4 scenarios."""
-    fig, ax = plt.subplots(figsize=(12, 7))
+    out_path = OUT_DIR / "cold_warm_comparison_bar.png"
+    if plot_is_cached(out_path, digest):
+        print(f"Skipping (cached): {out_path}")
+        return
+
+    ax = new_axes(fig, (12, 7))
 
     scenarios = ["Full Cold\n(build from source)", "Runtime Cold\n(serverless cold start)"]
     docker_means = []
@@ -152,16 +285,13 @@ def plot_grouped_bar(data):
     wasmtime_stds = []
 
     for start_type in ["full_cold", "runtime_cold"]:
-        docker_key = f"docker_{start_type}"
-        wasmtime_key = f"wasmtime_{start_type}"
+        docker_stats = stats[f"docker_{start_type}"]
+        wasmtime_stats = stats[f"wasmtime_{start_type}"]
 
-        docker_times = [e["total_ms"] for e in data.get(docker_key, [])]
-        wasmtime_times = [e["total_ms"] for e in data.get(wasmtime_key, [])]
-
-        docker_means.append(statistics.mean(docker_times) if docker_times else 0)
-        docker_stds.append(statistics.stdev(docker_times) if len(docker_times) > 1 else 0)
-        wasmtime_means.append(statistics.mean(wasmtime_times) if wasmtime_times else 0)
-        wasmtime_stds.append(statistics.stdev(wasmtime_times) if len(wasmtime_times) > 1 else 0)
+        docker_means.append(docker_stats["mean"])
+        docker_stds.append(docker_stats["std"])
+        wasmtime_means.append(wasmtime_stats["mean"])
+        wasmtime_stds.append(wasmtime_stats["std"])
 
     x = np.arange(len(scenarios))
     width = 0.35
@@ -191,18 +321,7 @@ def plot_grouped_bar(data):
 
     # Add value labels
     for bars, means in [(bars1, docker_means), (bars2, wasmtime_means)]:
-        for bar, mean in zip(bars, means):
-            height = bar.get_height()
-            ax.annotate(
-                f"{mean:.0f} ms",
-                xy=(bar.get_x() + bar.get_width() / 2, height),
-                xytext=(0, 5),
-                textcoords="offset points",
-                ha="center",
-                va="bottom",
-                fontsize=11,
-                fontweight="bold",
-            )
+        ax.bar_label(bars, labels=[f"{mean:.0f} ms" for mean in means], padding=5, fontsize=11, fontweight="bold")
 
     ax.set_ylabel("Time to First HTTP 200 (ms)", fontsize=12)
     ax.set_title("Cold Start Comparison: Docker vs Wasmtime", fontsize=14, fontweight="bold")
@@ -212,7 +331,7 @@ def plot_grouped_bar(data):
     ax.grid(axis="y", alpha=0.3)
 
     # Add sample size
-    n_samples = len(data.get("docker_full_cold", []))
+    n_samples = stats["docker_full_cold"]["count"]
     ax.text(
         0.02,
         0.98,
@@ -223,31 +342,23 @@ def plot_grouped_bar(data):
         style="italic",
     )
 
-    plt.tight_layout()
-    out_path = OUT_DIR / "cold_warm_comparison_bar.png"
-    plt.savefig(out_path, dpi=150, bbox_inches="tight")
-    print(f"Saved: {out_path}")
-    plt.close()
+    save_plot(fig, out_path, digest)
 
 
-def plot_stacked_breakdown(data):
+def plot_stacked_breakdown(fig, stats, digest):
     """Create stacked bar showing build vs start time breakdown."""
-    fig, ax = plt.subplots(figsize=(12, 7))
+    out_path = OUT_DIR / "cold_warm_breakdown_stacked.png"
+    if plot_is_cached(out_path, digest):
+        print(f"Skipping (cached): {out_path}")
+        return
+
+    ax = new_axes(fig, (12, 7))
 
     scenarios = ["Docker\nFull Cold", "Docker\nRuntime Cold", "Wasmtime\nFull Cold", "Wasmtime\nRuntime Cold"]
     keys = ["docker_full_cold", "docker_runtime_cold", "wasmtime_full_cold", "wasmtime_runtime_cold"]
 
-    build_means = []
-    start_means = []
-
-    for key in keys:
-        entries = data.get(key, [])
-        if entries:
-            build_means.append(statistics.mean([e["build_ms"] for e in entries]))
-            start_means.append(statistics.mean([e["start_ms"] for e in entries]))
-        else:
-            build_means.append(0)
-            start_means.append(0)
+    build_means = [stats[key]["build_mean"] for key in keys]
+    start_means = [stats[key]["start_mean"] for key in keys]
 
     x = np.arange(len(scenarios))
     width = 0.6
@@ -262,19 +373,9 @@ def plot_stacked_breakdown(data):
     bars1 = ax.bar(x, build_means, width, label="Build Time", color=color_build, edgecolor="black")
     bars2 = ax.bar(x, start_means, width, bottom=build_means, label="Runtime Start", color=color_start, edgecolor="black")
 
-    # Add total labels
-    for i, (b, s) in enumerate(zip(build_means, start_means)):
-        total = b + s
-        ax.annotate(
-            f"{total:.0f} ms",
-            xy=(i, total),
-            xytext=(0, 5),
-            textcoords="offset points",
-            ha="center",
-            va="bottom",
-            fontsize=11,
-            fontweight="bold",
-        )
+    # Add total labels at the top of each stack
+    totals = [b + s for b, s in zip(build_means, start_means)]
+    ax.bar_label(bars2, labels=[f"{total:.0f} ms" for total in totals], padding=5, fontsize=11, fontweight="bold")
 
     ax.set_ylabel("Time (ms)", fontsize=12)
     ax.set_title("Cold Start Breakdown: Build vs Runtime Start", fontsize=14, fontweight="bold")
@@ -283,16 +384,17 @@ def plot_stacked_breakdown(data):
     ax.legend(loc="upper right", fontsize=11)
     ax.grid(axis="y", alpha=0.3)
 
-    plt.tight_layout()
-    out_path = OUT_DIR / "cold_warm_breakdown_stacked.png"
-    plt.savefig(out_path, dpi=150, bbox_inches="tight")
-    print(f"Saved: {out_path}")
-    plt.close()
+    save_plot(fig, out_path, digest)
 
 
-def plot_boxplot(data):
+def plot_boxplot(fig, data, digest):
     """Create boxplot showing distribution of all scenarios."""
-    fig, ax = plt.subplots(figsize=(12, 7))
+    out_path = OUT_DIR / "cold_warm_comparison_boxplot.png"
+    if plot_is_cached(out_path, digest):
+        print(f"Skipping (cached): {out_path}")
+        return
+
+    ax = new_axes(fig, (12, 7))
 
     labels = ["Docker\nFull Cold", "Docker\nRuntime Cold", "Wasmtime\nFull Cold", "Wasmtime\nRuntime Cold"]
     keys = ["docker_full_cold", "docker_runtime_cold", "wasmtime_full_cold", "wasmtime_runtime_cold"]
@@ -300,9 +402,8 @@ def plot_boxplot(data):
 
     plot_data = []
     for key in keys:
-        entries = data.get(key, [])
-        times = [e["total_ms"] for e in entries] if entries else [0]
-        plot_data.append(times)
+        times = data[key]["total_ms"]
+        plot_data.append(times if times.size else [0])
 
     bp = ax.boxplot(
         plot_data,
@@ -320,28 +421,31 @@ def plot_boxplot(data):
     ax.set_title("Cold Start Distribution: Docker vs Wasmtime", fontsize=14, fontweight="bold")
     ax.grid(axis="y", alpha=0.3)
 
-    mean_patch = mpatches.Patch(color="red", label="Mean (diamond)")
+    from matplotlib.patches import Patch
+
+    mean_patch = Patch(color="red", label="Mean (diamond)")
     ax.legend(handles=[mean_patch], loc="upper right")
 
-    plt.tight_layout()
-    out_path = OUT_DIR / "cold_warm_comparison_boxplot.png"
-    plt.savefig(out_path, dpi=150, bbox_inches="tight")
-    print(f"Saved: {out_path}")
-    plt.close()
+    save_plot(fig, out_path, digest)
 
 
-def plot_speedup_chart(data):
+def plot_speedup_chart(fig, stats, digest):
     """Create chart showing speedup factors."""
-    fig, ax = plt.subplots(figsize=(10, 6))
+    out_path = OUT_DIR / "cold_warm_speedup.png"
+    if plot_is_cached(out_path, digest):
+        print(f"Skipping (cached): {out_path}")
+        return
+
+    ax = new_axes(fig, (10, 6))
 
     comparisons = []
     speedups = []
     colors = []
 
     # Full cold start comparison
-    if data.get("docker_full_cold") and data.get("wasmtime_full_cold"):
-        docker_full = statistics.mean([e["total_ms"] for e in data["docker_full_cold"]])
-        wasmtime_full = statistics.mean([e["total_ms"] for e in data["wasmtime_full_cold"]])
+    if stats["docker_full_cold"]["count"] and stats["wasmtime_full_cold"]["count"]:
+        docker_full = stats["docker_full_cold"]["mean"]
+        wasmtime_full = stats["wasmtime_full_cold"]["mean"]
         if wasmtime_full < docker_full:
             speedup = docker_full / wasmtime_full
             comparisons.append("Full Cold\n(Wasmtime wins)")
@@ -354,9 +458,9 @@ def plot_speedup_chart(data):
             colors.append("#2496ED")  # Blue - Docker wins
 
     # Runtime cold start comparison (the important one for serverless)
-    if data.get("docker_runtime_cold") and data.get("wasmtime_runtime_cold"):
-        docker_runtime = statistics.mean([e["total_ms"] for e in data["docker_runtime_cold"]])
-        wasmtime_runtime = statistics.mean([e["total_ms"] for e in data["wasmtime_runtime_cold"]])
+    if stats["docker_runtime_cold"]["count"] and stats["wasmtime_runtime_cold"]["count"]:
+        docker_runtime = stats["docker_runtime_cold"]["mean"]
+        wasmtime_runtime = stats["wasmtime_runtime_cold"]["mean"]
         if wasmtime_runtime < docker_runtime:
             speedup = docker_runtime / wasmtime_runtime
             comparisons.append("Runtime Cold\n(Wasmtime wins)")
@@ -372,18 +476,7 @@ def plot_speedup_chart(data):
     bars = ax.bar(x, speedups, color=colors, edgecolor="black", linewidth=1.2)
 
     # Add value labels
-    for bar, speedup in zip(bars, speedups):
-        height = bar.get_height()
-        ax.annotate(
-            f"{speedup:.1f}x faster",
-            xy=(bar.get_x() + bar.get_width() / 2, height),
-            xytext=(0, 5),
-            textcoords="offset points",
-            ha="center",
-            va="bottom",
-            fontsize=12,
-            fontweight="bold",
-        )
+    ax.bar_label(bars, labels=[f"{speedup:.1f}x faster" for speedup in speedups], padding=5, fontsize=12, fontweight="bold")
 
     ax.axhline(y=1, color="gray", linestyle="--", alpha=0.5)
     ax.set_ylabel("Speedup Factor", fontsize=12)
@@ -393,11 +486,7 @@ def plot_speedup_chart(data):
     ax.set_ylim(0, max(speedups) * 1.2 if speedups else 2)
     ax.grid(axis="y", alpha=0.3)
 
-    plt.tight_layout()
-    out_path = OUT_DIR / "cold_warm_speedup.png"
-    plt.savefig(out_path, dpi=150, bbox_inches="tight")
-    print(f"Saved: {out_path}")
-    plt.close()
+    save_plot(fig, out_path, digest)
 
 
 def main():
@@ -405,18 +494,25 @@ def main():
     if data is None:
         return
 
-    has_data = any(data.get(k) for k in data)
+    has_data = any(cols["total_ms"].size for cols in data.values())
     if not has_data:
         print("No data found for any scenario.")
         return
 
     print_summary(data)
 
-    # Generate all plots
-    plot_grouped_bar(data)
-    plot_stacked_breakdown(data)
-    plot_boxplot(data)
-    plot_speedup_chart(data)
+    # Generate all plots, skipping any already rendered from identical data
+    digest = data_digest(data)
+    stats = compute_plot_stats(data)
+    plt = load_pyplot()
+    # One Figure is reused for every plot (see new_axes), so layout is done explicitly
+    plt.rcParams.update({"figure.autolayout": False, "figure.max_open_warning": 0})
+    fig = plt.figure()
+    plot_grouped_bar(fig, stats, digest)
+    plot_stacked_breakdown(fig, stats, digest)
+    plot_boxplot(fig, data, digest)
+    plot_speedup_chart(fig, stats, digest)
+    plt.close(fig)
 
     print(f"\nAll graphs saved to: {OUT_DIR}")
 
@@ -1,20 +1,12 @@
 #!/usr/bin/env python3
-import re
-import statistics
-import sys
+import array
+from functools import lru_cache
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import numpy as np
 
-# Try to import scipy for statistical tests, gracefully handle if not available
-try:
-    from scipy import stats as scipy_stats
-    SCIPY_AVAILABLE = True
-except ImportError:
-    SCIPY_AVAILABLE = False
-    print("[WARN] scipy not available. Statistical significance tests will be skipped.")
-    print("  Install with: pip install scipy")
+from _log_parsers import load_parsed, parse_outer_ms_log
+from _plotting import PLOT_DPI, load_pyplot
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 
@@ -28,39 +20,52 @@ RUNTIMES = {
 OUT_DIR = ROOT_DIR / "results" / "processed"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
-RUN_LOG_PATTERN = re.compile(r".*_run\.log$")
-OUTER_MS_PATTERN = re.compile(r"outer_ms=([0-9.]+)")
-
 
 def load_samples(path: Path):
-    samples = []
-    for log in sorted(path.glob("*_run.log")):
-        if not RUN_LOG_PATTERN.match(log.name):
-            continue
-        with log.open("r") as f:
-            for line in f:
-                m = OUTER_MS_PATTERN.search(line)
-                if m:
-                    samples.append(float(m.group(1)))
-    return samples
+    # Unboxed doubles end to end; the returned ndarray shares the array's buffer
+    samples = array.array("d")
+    extend = samples.extend
+    for _, values in load_parsed(path, parse_outer_ms_log):
+        extend(values)
+    return np.frombuffer(samples, dtype=np.float64)
+
+
+@lru_cache(maxsize=None)
+def load_scipy_stats():
+    """Import scipy.stats on first use; None (after a one-time warning) if it is not installed."""
+    try:
+        from scipy import stats
+    except ImportError:
+        print("[WARN] scipy not available. Statistical significance tests will be skipped.")
+        print("  Install with: pip install scipy")
+        return None
+    return stats
+
+
+@lru_cache(maxsize=256)
+def _t_ppf(n, confidence):
+    """Two-sided t critical value for n samples, memoized per (n, confidence)."""
+    return load_scipy_stats().t.ppf((1 + confidence) / 2, n - 1)
 
 
 def compute_confidence_interval(samples, confidence=0.95):
     """Compute confidence interval for the mean using t-distribution."""
-    if not SCIPY_AVAILABLE or len(samples) < 2:
+    scipy_stats = load_scipy_stats()
+    if scipy_stats is None or len(samples) < 2:
         return None, None
     
     mean = np.mean(samples)
     n = len(samples)
     std_err = scipy_stats.sem(samples)
-    margin = std_err * scipy_stats.t.ppf((1 + confidence) / 2, n - 1)
+    margin = std_err * _t_ppf(n, confidence)
     
     return mean - margin, mean + margin
 
 
 def compare_runtimes_statistically(data):
     """Perform pairwise statistical tests between runtimes."""
-    if not SCIPY_AVAILABLE:
+    scipy_stats = load_scipy_stats()
+    if scipy_stats is None:
         return
     
     print("\n" + "=" * 80)
@@ -82,8 +87,8 @@ def compare_runtimes_statistically(data):
                 samples1, samples2, alternative='two-sided'
             )
             
-            mean1 = statistics.mean(samples1)
-            mean2 = statistics.mean(samples2)
+            mean1 = samples1.mean()
+            mean2 = samples2.mean()
             diff_pct = ((mean2 - mean1) / mean1) * 100
             
             significance = "***" if p_value < 0.001 else "**" if p_value < 0.01 else "*" if p_value < 0.05 else "ns"
@@ -101,7 +106,7 @@ def main():
     data = {}
     for rt, path in RUNTIMES.items():
         samples = load_samples(path)
-        if samples:
+        if samples.size:
             data[rt] = samples
             if len(samples) < 3:
                 print(f"[WARN] Only {len(samples)} samples for {rt}. Recommend at least 5 for statistical validity.")
@@ -116,9 +121,9 @@ def main():
     print("CPU-HASH SUMMARY (execution time)")
     print("=" * 80)
     for rt, samples in data.items():
-        mean_val = statistics.mean(samples)
-        median_val = statistics.median(samples)
-        stdev_val = statistics.stdev(samples) if len(samples) > 1 else 0
+        mean_val = samples.mean()
+        median_val = np.median(samples)
+        stdev_val = samples.std(ddof=1) if samples.size > 1 else 0
         
         ci_low, ci_high = compute_confidence_interval(samples)
         ci_str = f", 95% CI=[{ci_low:.3f}, {ci_high:.3f}]" if ci_low is not None else ""
@@ -126,13 +131,14 @@ def main():
         print(
             f"- {rt:10s}: mean={mean_val:7.3f} ± {stdev_val:6.3f} ms, "
             f"median={median_val:7.3f} ms, "
-            f"range=[{min(samples):.3f}, {max(samples):.3f}], "
+            f"range=[{samples.min():.3f}, {samples.max():.3f}], "
             f"n={len(samples)}{ci_str}"
         )
     
     # Statistical comparisons
     compare_runtimes_statistically(data)
 
+    plt = load_pyplot()
     labels = list(data.keys())
     series = [data[k] for k in labels]
 
@@ -150,13 +156,13 @@ def main():
     ax.grid(axis="y", alpha=0.3)
     
     out_box = OUT_DIR / "cpu_hash_outer_ms_boxplot.png"
-    plt.savefig(out_box, dpi=300, bbox_inches="tight")
+    plt.savefig(out_box, dpi=PLOT_DPI, bbox_inches="tight")
     print(f"\nSaved boxplot to {out_box}")
     plt.close()
 
     # Bar chart with error bars and confidence intervals
-    means = [statistics.mean(s) for s in series]
-    stdevs = [statistics.stdev(s) if len(s) > 1 else 0 for s in series]
+    means = [s.mean() for s in series]
+    stdevs = [s.std(ddof=1) if s.size > 1 else 0 for s in series]
     x = range(len(labels))
 
     fig, ax = plt.subplots(figsize=(10, 6))
@@ -178,7 +184,7 @@ def main():
                 ha='center', va='bottom', fontsize=10)
     
     out_bar = OUT_DIR / "cpu_hash_outer_ms_bar.png"
-    plt.savefig(out_bar, dpi=300, bbox_inches="tight")
+    plt.savefig(out_bar, dpi=PLOT_DPI, bbox_inches="tight")
     print(f"Saved bar chart to {out_bar}")
     plt.close()
     
@@ -187,70 +193,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-
-
-def main():
-    data = {}
-    for rt, path in RUNTIMES.items():
-        samples = load_samples(path)
-        if samples:
-            data[rt] = samples
-            if len(samples) < 3:
-                print(f"[WARN] Only {len(samples)} samples for {rt}. Recommend at least 5 for statistical validity.")
-        else:
-            print(f"[WARN] No cpu-hash samples for {rt} in {path}")
-
-    if not data:
-        print("No cpu-hash data found.")
-        return
-
-    print("\n" + "=" * 80)
-    print("CPU-HASH SUMMARY (execution time)")
-    print("=" * 80)
-    for rt, samples in data.items():
-        mean_val = statistics.mean(samples)
-        median_val = statistics.median(samples)
-        stdev_val = statistics.stdev(samples) if len(samples) > 1 else 0
-        
-        ci_low, ci_high = compute_confidence_interval(samples)
-        ci_str = f", 95% CI=[{ci_low:.3f}, {ci_high:.3f}]" if ci_low is not None else ""
-        
-        print(
-            f"- {rt:10s}: mean={mean_val:7.3f} ± {stdev_val:6.3f} ms, "
-            f"median={median_val:7.3f} ms, "
-            f"range=[{min(samples):.3f}, {max(samples):.3f}], "
-            f"n={len(samples)}{ci_str}"
-        )
-    
-    # Statistical comparisons
-    compare_runtimes_statistically(data)
-
-    labels = list(data.keys())
-    series = [data[k] for k in labels]
-
-    plt.figure()
-    plt.boxplot(series, tick_labels=labels, showfliers=True)
-    plt.ylabel("Execution time (ms)")
-    plt.title("CPU-hash execution time by runtime")
-    plt.grid(axis="y", alpha=0.3)
-    out_box = OUT_DIR / "cpu_hash_outer_ms_boxplot.png"
-    plt.savefig(out_box, bbox_inches="tight")
-    print(f"Saved boxplot to {out_box}")
-
-    means = [statistics.mean(s) for s in series]
-    x = range(len(labels))
-
-    plt.figure()
-    plt.bar(x, means)
-    plt.xticks(x, labels)
-    plt.ylabel("Execution time (ms)")
-    plt.title("CPU-hash mean execution time by runtime")
-    plt.grid(axis="y", alpha=0.3)
-    out_bar = OUT_DIR / "cpu_hash_outer_ms_bar.png"
-    plt.savefig(out_bar, bbox_inches="tight")
-    print(f"Saved bar chart to {out_bar}")
-
-
-if __name__ == "__main__":
-    main()
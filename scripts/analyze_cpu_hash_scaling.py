@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
-import re
-import statistics
-from collections import defaultdict
 from pathlib import Path
 
-import matplotlib.pyplot as plt
+import numpy as np
+
+from _log_parsers import load_parsed, parse_cpu_scaling_log
+from _plotting import PLOT_DPI, load_pyplot
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 
@@ -18,31 +18,37 @@ RUNTIMES = {
 OUT_DIR = ROOT_DIR / "results" / "processed"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
-RUN_LOG_PATTERN = re.compile(r".*_run\.log$")
-SCALE_LINE_PATTERN = re.compile(r"conc=(\d+).*throughput_iter_s=([0-9.]+)")
-
 
 def load_samples(path: Path):
-    samples = defaultdict(list)
-    for log in sorted(path.glob("*_run.log")):
-        if not RUN_LOG_PATTERN.match(log.name):
-            continue
-        with log.open("r") as f:
-            for line in f:
-                m = SCALE_LINE_PATTERN.search(line)
-                if m:
-                    conc = int(m.group(1))
-                    throughput = float(m.group(2))
-                    samples[conc].append(throughput)
-    return samples
+    """Return parallel (concurrency, throughput) arrays for every sample under path."""
+    pairs = []
+    extend = pairs.extend
+    for _, log_pairs in load_parsed(path, parse_cpu_scaling_log):
+        extend(log_pairs)
+    arr = np.asarray(pairs, dtype=np.float64).reshape(-1, 2)
+    return arr[:, 0].astype(np.int32), arr[:, 1]
+
+
+def aggregate_by_conc(concs, throughput):
+    """Per-concurrency mean/min/max/count of throughput, computed over sorted segments."""
+    order = np.argsort(concs, kind="stable")
+    concs, throughput = concs[order], throughput[order]
+    levels, starts, counts = np.unique(concs, return_index=True, return_counts=True)
+    return {
+        "conc": levels,
+        "mean": np.add.reduceat(throughput, starts) / counts,
+        "min": np.minimum.reduceat(throughput, starts),
+        "max": np.maximum.reduceat(throughput, starts),
+        "n": counts,
+    }
 
 
 def main():
     data = {}
     for rt, path in RUNTIMES.items():
-        samples = load_samples(path)
-        if samples:
-            data[rt] = samples
+        concs, throughput = load_samples(path)
+        if concs.size:
+            data[rt] = aggregate_by_conc(concs, throughput)
         else:
             print(f"[WARN] No cpu-hash scaling samples for {rt} in {path}")
 
@@ -51,20 +57,17 @@ def main():
         return
 
     print("CPU-hash scaling summary (throughput_iter_s):")
-    for rt, conc_map in data.items():
-        concs = sorted(conc_map.keys())
-        for conc in concs:
-            vals = conc_map[conc]
+    for rt, agg in data.items():
+        for conc, mean, lo, hi, n in zip(agg["conc"], agg["mean"], agg["min"], agg["max"], agg["n"]):
             print(
-                f"- {rt} conc={conc}: mean={statistics.mean(vals):.3f} "
-                f"min={min(vals):.3f} max={max(vals):.3f} n={len(vals)}"
+                f"- {rt} conc={conc}: mean={mean:.3f} "
+                f"min={lo:.3f} max={hi:.3f} n={n}"
             )
 
+    plt = load_pyplot()
     plt.figure()
-    for rt, conc_map in data.items():
-        concs = sorted(conc_map.keys())
-        means = [statistics.mean(conc_map[c]) for c in concs]
-        plt.plot(concs, means, marker="o", label=rt)
+    for rt, agg in data.items():
+        plt.plot(agg["conc"], agg["mean"], marker="o", label=rt)
 
     plt.xlabel("Concurrency (instances)")
     plt.ylabel("Throughput (iterations/sec)")
@@ -73,7 +76,7 @@ def main():
     plt.legend()
 
     out_plot = OUT_DIR / "cpu_hash_scaling_throughput.png"
-    plt.savefig(out_plot, bbox_inches="tight")
+    plt.savefig(out_plot, dpi=PLOT_DPI, bbox_inches="tight")
     print(f"Saved scaling plot to {out_plot}")
 
 
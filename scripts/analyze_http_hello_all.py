@@ -1,96 +1,36 @@
 #!/usr/bin/env python3
-import re
 import statistics
 from pathlib import Path
 
-import matplotlib.pyplot as plt
+import numpy as np
+
+from _agg_nb import agg_stats, box_stats
+from _log_parsers import load_parsed, parse_run_log, runtime_dirs
+from _plotting import PLOT_DPI, load_pyplot
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 
-RUNTIMES = {
-    "native": ROOT_DIR / "results" / "raw" / "native" / "http-hello",
-    "docker": ROOT_DIR / "results" / "raw" / "docker" / "http-hello",
-    "wasmcloud": ROOT_DIR / "results" / "raw" / "wasmcloud" / "http-hello",
-    "wasmtime": ROOT_DIR / "results" / "raw" / "wasmtime" / "http-hello",
-}
+RUNTIMES = runtime_dirs("http-hello", ("native", "docker", "wasmcloud", "wasmtime"))
 
 OUT_DIR = ROOT_DIR / "results" / "processed"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
-RUN_LOG_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2}Z)_run\.log$")
-COLD_START_PATTERN = re.compile(r"cold_start_ms=(\d+\.?\d*)")
-LATENCY_PATTERN = re.compile(
-    r"req=(\d+)\s+http_code=(\d{3})\s+latency_ns=(\d+)\s+latency_ms=(\d+\.?\d*)"
-)
-RESOURCE_PATTERN = re.compile(r"rss_kb=(\d+)\s+cpu_pct=([0-9.]+)")
-THROUGHPUT_PATTERN = re.compile(r"throughput_rps=([0-9.]+)")
-
-
-def parse_run_log(path: Path):
-    m = RUN_LOG_PATTERN.search(path.name)
-    if not m:
-        return None
-    run_id = m.group(1)
-
-    cold_start_ms = None
-    latencies_ms = []
-    rss_kb = None
-    cpu_pct = None
-    throughput_rps = None
-
-    with path.open("r") as f:
-        for line in f:
-            line = line.strip()
-
-            m_cs = COLD_START_PATTERN.search(line)
-            if m_cs:
-                cold_start_ms = float(m_cs.group(1))
-
-            m_lat = LATENCY_PATTERN.search(line)
-            if m_lat:
-                http_code = int(m_lat.group(2))
-                latency_ms = float(m_lat.group(4))
-                if http_code == 200:
-                    latencies_ms.append(latency_ms)
-
-            m_res = RESOURCE_PATTERN.search(line)
-            if m_res:
-                rss_kb = int(m_res.group(1))
-                cpu_pct = float(m_res.group(2))
-
-            m_tp = THROUGHPUT_PATTERN.search(line)
-            if m_tp:
-                throughput_rps = float(m_tp.group(1))
-
-    if cold_start_ms is None or not latencies_ms:
-        return None
-
-    return {
-        "run_id": run_id,
-        "cold_start_ms": cold_start_ms,
-        "latencies_ms": latencies_ms,
-        "rss_kb": rss_kb,
-        "cpu_pct": cpu_pct,
-        "throughput_rps": throughput_rps,
-    }
-
 
 def load_runtime(runtime: str, dir_path: Path):
-    logs = sorted(dir_path.glob("*_run.log"))
-    runs = []
-    for p in logs:
-        parsed = parse_run_log(p)
-        if parsed:
-            runs.append(parsed)
-    return runs
+    return [
+        parsed
+        for _, parsed in load_parsed(dir_path, parse_run_log)
+        if parsed and parsed["cold_start_ms"] is not None and parsed["latencies_ms"].size
+    ]
 
 
 def agg_latencies(latencies):
+    mean, median, lo, hi, _std = agg_stats(np.ascontiguousarray(latencies, dtype=np.float64))
     return {
-        "mean": statistics.mean(latencies),
-        "median": statistics.median(latencies),
-        "min": min(latencies),
-        "max": max(latencies),
+        "mean": mean,
+        "median": median,
+        "min": lo,
+        "max": hi,
     }
 
 
@@ -105,18 +45,20 @@ def main():
 
     if not data:
         print("No data found for any runtime.")
-        return
+        return 1
+
+    # All latencies per runtime as one contiguous buffer, shared by the summary and the boxplot
+    all_lat_by_rt = {rt: np.concatenate([r["latencies_ms"] for r in runs]) for rt, runs in data.items()}
 
     # Text summary
     print("Summary per runtime:")
     for rt, runs in data.items():
-        cs = [r["cold_start_ms"] for r in runs]
-        all_lat = [x for r in runs for x in r["latencies_ms"]]
-        lat_stats = agg_latencies(all_lat)
+        cs = np.array([r["cold_start_ms"] for r in runs])
+        lat_stats = agg_latencies(all_lat_by_rt[rt])
         rss_vals = [r["rss_kb"] for r in runs if r.get("rss_kb") is not None]
         tp_vals = [r["throughput_rps"] for r in runs if r.get("throughput_rps") is not None]
-        rss_mean = statistics.mean(rss_vals) if rss_vals else None
-        tp_mean = statistics.mean(tp_vals) if tp_vals else None
+        rss_mean = statistics.fmean(rss_vals) if rss_vals else None
+        tp_mean = statistics.fmean(tp_vals) if tp_vals else None
         rss_mean_str = f"{rss_mean:.0f}" if rss_mean is not None else "NA"
         tp_mean_str = f"{tp_mean:.1f}" if tp_mean is not None else "NA"
         density_str = "NA"
@@ -129,8 +71,8 @@ def main():
             efficiency_str = f"{efficiency:.2f}"
         print(
             f"- {rt}: "
-            f"cold_start_ms mean={statistics.mean(cs):.3f}, "
-            f"min={min(cs):.3f}, max={max(cs):.3f}; "
+            f"cold_start_ms mean={cs.mean():.3f}, "
+            f"min={cs.min():.3f}, max={cs.max():.3f}; "
             f"latency_ms mean={lat_stats['mean']:.3f}, "
             f"p50={lat_stats['median']:.3f}, "
             f"min={lat_stats['min']:.3f}, max={lat_stats['max']:.3f}; "
@@ -147,14 +89,15 @@ def main():
     cold_maxs = []
 
     for rt, runs in data.items():
-        cs = [r["cold_start_ms"] for r in runs]
+        cs = np.array([r["cold_start_ms"] for r in runs])
         runtimes.append(rt)
-        cold_means.append(statistics.mean(cs))
-        cold_mins.append(min(cs))
-        cold_maxs.append(max(cs))
+        cold_means.append(cs.mean())
+        cold_mins.append(cs.min())
+        cold_maxs.append(cs.max())
 
     x = range(len(runtimes))
 
+    plt = load_pyplot()
     plt.figure()
     plt.bar(x, cold_means)
     plt.xticks(x, runtimes)
@@ -162,25 +105,20 @@ def main():
     plt.title("HTTP hello cold start – mean per runtime")
     plt.grid(axis="y", alpha=0.3)
     out_cold = OUT_DIR / "http_hello_cold_start_mean_by_runtime.png"
-    plt.savefig(out_cold, bbox_inches="tight")
+    plt.savefig(out_cold, dpi=PLOT_DPI, bbox_inches="tight")
     print(f"Saved cold start comparison to {out_cold}")
+    plt.close()
 
     # Latency boxplot per runtime
-    latency_data = []
-    labels = []
-    for rt, runs in data.items():
-        all_lat = [x for r in runs for x in r["latencies_ms"]]
-        latency_data.append(all_lat)
-        labels.append(rt)
-
     plt.figure()
-    plt.boxplot(latency_data, tick_labels=labels, showfliers=True)
+    plt.gca().bxp([box_stats(lat, rt) for rt, lat in all_lat_by_rt.items()], showfliers=True)
     plt.ylabel("Latency (ms)")
     plt.title("HTTP hello per-request latency by runtime")
     plt.grid(axis="y", alpha=0.3)
     out_lat = OUT_DIR / "http_hello_latency_boxplot_by_runtime.png"
-    plt.savefig(out_lat, bbox_inches="tight")
+    plt.savefig(out_lat, dpi=PLOT_DPI, bbox_inches="tight")
     print(f"Saved latency comparison to {out_lat}")
+    plt.close()
 
     # Throughput bar chart
     tp_runtimes = []
@@ -190,7 +128,7 @@ def main():
         if not tps:
             continue
         tp_runtimes.append(rt)
-        tp_means.append(statistics.mean(tps))
+        tp_means.append(statistics.fmean(tps))
 
     if tp_runtimes:
         x = range(len(tp_runtimes))
@@ -201,8 +139,9 @@ def main():
         plt.title("HTTP hello throughput – mean per runtime")
         plt.grid(axis="y", alpha=0.3)
         out_tp = OUT_DIR / "http_hello_throughput_mean_by_runtime.png"
-        plt.savefig(out_tp, bbox_inches="tight")
+        plt.savefig(out_tp, dpi=PLOT_DPI, bbox_inches="tight")
         print(f"Saved throughput comparison to {out_tp}")
+        plt.close()
 
     # Memory usage bar chart
     mem_runtimes = []
@@ -212,7 +151,7 @@ def main():
         if not rss_vals:
             continue
         mem_runtimes.append(rt)
-        mem_means.append(statistics.mean(rss_vals))
+        mem_means.append(statistics.fmean(rss_vals))
 
     if mem_runtimes:
         x = range(len(mem_runtimes))
@@ -223,9 +162,11 @@ def main():
         plt.title("HTTP hello memory footprint – mean per runtime")
         plt.grid(axis="y", alpha=0.3)
         out_mem = OUT_DIR / "http_hello_rss_mean_by_runtime.png"
-        plt.savefig(out_mem, bbox_inches="tight")
+        plt.savefig(out_mem, dpi=PLOT_DPI, bbox_inches="tight")
         print(f"Saved memory comparison to {out_mem}")
+        plt.close()
 
 
 if __name__ == "__main__":
+    # Exit 0 without data so run_all_benchmarks.sh keeps going; analyze_all.py reads main()'s 1
     main()
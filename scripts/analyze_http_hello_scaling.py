@@ -4,75 +4,83 @@ Analyze HTTP hello-world scaling performance across runtimes.
 Generates throughput vs concurrency plots and scaling efficiency metrics.
 """
 
-import re
-import statistics
 import sys
-from collections import defaultdict
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import numpy as np
 
+from _agg_nb import agg_per_conc
+from _log_parsers import load_parsed, parse_scaling_log, runtime_dirs
+from _plotting import PLOT_DPI, load_pyplot
+
 ROOT_DIR = Path(__file__).resolve().parents[1]
 
-RUNTIMES = {
-    "native": ROOT_DIR / "results" / "raw" / "native" / "http-hello-scaling",
-    "docker": ROOT_DIR / "results" / "raw" / "docker" / "http-hello-scaling",
-    "wasmtime": ROOT_DIR / "results" / "raw" / "wasmtime" / "http-hello-scaling",
-}
+RUNTIMES = runtime_dirs("http-hello-scaling", ("native", "docker", "wasmtime"))
 
 OUT_DIR = ROOT_DIR / "results" / "processed"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
-# Regex patterns for log parsing
-RUN_LOG_PATTERN = re.compile(r".*_run\.log$")
-SCALE_LINE_PATTERN = re.compile(
-    r"run=(\d+)\s+conc=(\d+)\s+total_requests=(\d+)\s+elapsed_ms=([0-9.]+)\s+"
-    r"throughput_rps=([0-9.]+).*total_rss_kb=(\d+).*avg_rss_kb=(\d+)"
-)
-INSTANCE_LINE_PATTERN = re.compile(
-    r"instance=(\d+)\s+rps=([0-9.]+).*avg_lat_ns=([0-9.]+).*"
-    r"p50_lat_ns=([0-9.]+).*p95_lat_ns=([0-9.]+).*p99_lat_ns=([0-9.]+)"
-)
-
 
 def load_samples(path: Path):
     """Load scaling benchmark samples from log files."""
-    samples = defaultdict(lambda: defaultdict(list))
+    samples = {}
     
-    for log in sorted(path.glob("*_run.log")):
-        if not RUN_LOG_PATTERN.match(log.name):
-            continue
-        
-        with log.open("r") as f:
-            for line in f:
-                m = SCALE_LINE_PATTERN.search(line)
-                if m:
-                    conc = int(m.group(2))
-                    throughput_rps = float(m.group(5))
-                    total_rss_kb = int(m.group(6))
-                    avg_rss_kb = int(m.group(7))
-                    
-                    samples[conc]["throughput_rps"].append(throughput_rps)
-                    samples[conc]["total_rss_kb"].append(total_rss_kb)
-                    samples[conc]["avg_rss_kb"].append(avg_rss_kb)
+    for _, rows in load_parsed(path, parse_scaling_log):
+        for conc, throughput_rps, total_rss_kb, avg_rss_kb in rows:
+            conc_samples = samples.get(conc)
+            if conc_samples is None:
+                conc_samples = samples[conc] = {"throughput_rps": [], "total_rss_kb": [], "avg_rss_kb": []}
+            conc_samples["throughput_rps"].append(throughput_rps)
+            conc_samples["total_rss_kb"].append(total_rss_kb)
+            conc_samples["avg_rss_kb"].append(avg_rss_kb)
     
-    return dict(samples)
+    # One contiguous float64 array per metric and concurrency level for the downstream stats
+    return {
+        conc: {metric: np.asarray(values, dtype=np.float64) for metric, values in conc_samples.items()}
+        for conc, conc_samples in samples.items()
+    }
+
+
+def aggregate(data):
+    """Reduce raw samples to per-(runtime, concurrency) stats, shared by the summary and every plot.
+
+    Returns {runtime: {conc: {"tp_mean", "tp_stdev", "rss_mean", "total_rss_mean", "n"}}}
+    with concurrency levels in ascending order.
+    """
+    aggs = {}
+    for rt, conc_map in data.items():
+        concs = sorted(conc_map)
+        # Throughput for every level back to back, split by offsets (ragged SoA layout)
+        tp_groups = [conc_map[conc]["throughput_rps"] for conc in concs]
+        offsets = np.zeros(len(concs) + 1, dtype=np.int64)
+        np.cumsum([len(tp) for tp in tp_groups], out=offsets[1:])
+        tp_means, tp_stdevs = agg_per_conc(np.concatenate(tp_groups), offsets)
+
+        aggs[rt] = {
+            conc: {
+                "tp_mean": tp_means[i],
+                "tp_stdev": tp_stdevs[i],
+                "rss_mean": conc_map[conc]["avg_rss_kb"].mean(),
+                "total_rss_mean": conc_map[conc]["total_rss_kb"].mean(),
+                "n": len(tp_groups[i]),
+            }
+            for i, conc in enumerate(concs)
+        }
+    return aggs
 
 
-def calculate_scaling_efficiency(data, runtime):
+def calculate_scaling_efficiency(aggs, runtime):
     """Calculate scaling efficiency: actual_speedup / ideal_speedup."""
-    conc_map = data[runtime]
-    concs = sorted(conc_map.keys())
+    conc_aggs = aggs[runtime]
     
-    if not concs or 1 not in concs:
+    if 1 not in conc_aggs:
         return {}
     
-    baseline_throughput = statistics.mean(conc_map[1]["throughput_rps"])
+    baseline_throughput = conc_aggs[1]["tp_mean"]
     
     efficiency = {}
-    for conc in concs:
-        actual_throughput = statistics.mean(conc_map[conc]["throughput_rps"])
+    for conc, agg in conc_aggs.items():
+        actual_throughput = agg["tp_mean"]
         actual_speedup = actual_throughput / baseline_throughput
         ideal_speedup = conc
         eff = (actual_speedup / ideal_speedup) * 100
@@ -85,35 +93,24 @@ def calculate_scaling_efficiency(data, runtime):
     return efficiency
 
 
-def print_summary(data):
+def print_summary(aggs):
     """Print text summary of scaling results."""
     print("\n" + "=" * 80)
     print("HTTP HELLO-WORLD SCALING SUMMARY")
     print("=" * 80)
     
-    for rt, conc_map in data.items():
+    for rt, conc_aggs in aggs.items():
         print(f"\n{rt.upper()}:")
         print("-" * 80)
         
-        concs = sorted(conc_map.keys())
-        for conc in concs:
-            tp_vals = conc_map[conc]["throughput_rps"]
-            rss_vals = conc_map[conc]["avg_rss_kb"]
-            
-            if not tp_vals:
-                continue
-            
-            tp_mean = statistics.mean(tp_vals)
-            tp_stdev = statistics.stdev(tp_vals) if len(tp_vals) > 1 else 0
-            rss_mean = statistics.mean(rss_vals)
-            
+        for conc, agg in conc_aggs.items():
             print(f"  Concurrency {conc:2d}: "
-                  f"throughput={tp_mean:8.1f} ± {tp_stdev:6.1f} req/s  "
-                  f"avg_memory={rss_mean/1024:7.1f} MB  "
-                  f"samples={len(tp_vals)}")
+                  f"throughput={agg['tp_mean']:8.1f} ± {agg['tp_stdev']:6.1f} req/s  "
+                  f"avg_memory={agg['rss_mean']/1024:7.1f} MB  "
+                  f"samples={agg['n']}")
         
         # Calculate and print scaling efficiency
-        efficiency = calculate_scaling_efficiency(data, rt)
+        efficiency = calculate_scaling_efficiency(aggs, rt)
         if efficiency:
             print(f"\n  Scaling Efficiency:")
             for conc in sorted(efficiency.keys()):
@@ -122,18 +119,18 @@ def print_summary(data):
                       f"(efficiency: {eff_data['efficiency_pct']:.1f}%)")
 
 
-def plot_throughput_vs_concurrency(data, out_path):
+def plot_throughput_vs_concurrency(plt, aggs, out_path):
     """Generate line plot of throughput vs concurrency."""
     plt.figure(figsize=(10, 6))
     
-    for rt, conc_map in data.items():
-        concs = sorted(conc_map.keys())
-        means = [statistics.mean(conc_map[c]["throughput_rps"]) for c in concs]
-        stdevs = [statistics.stdev(conc_map[c]["throughput_rps"]) if len(conc_map[c]["throughput_rps"]) > 1 else 0 
-                  for c in concs]
+    for rt, conc_aggs in aggs.items():
+        concs = list(conc_aggs)
+        means = np.array([agg["tp_mean"] for agg in conc_aggs.values()])
+        stdevs = np.array([agg["tp_stdev"] for agg in conc_aggs.values()])
         
-        plt.errorbar(concs, means, yerr=stdevs, marker='o', label=rt, 
-                    linewidth=2, markersize=8, capsize=5)
+        # One line plus a shaded ±1 stdev band instead of per-point error bar artists
+        (line,) = plt.plot(concs, means, marker='o', label=rt, linewidth=2, markersize=8)
+        plt.fill_between(concs, means - stdevs, means + stdevs, color=line.get_color(), alpha=0.2)
     
     plt.xlabel("Concurrent Instances", fontsize=12)
     plt.ylabel("Aggregate Throughput (req/s)", fontsize=12)
@@ -142,17 +139,17 @@ def plot_throughput_vs_concurrency(data, out_path):
     plt.legend(fontsize=10)
     plt.tight_layout()
     
-    plt.savefig(out_path, dpi=300, bbox_inches='tight')
+    plt.savefig(out_path, dpi=PLOT_DPI, bbox_inches='tight')
     print(f"Saved throughput plot to {out_path}")
     plt.close()
 
 
-def plot_scaling_efficiency(data, out_path):
+def plot_scaling_efficiency(plt, aggs, out_path):
     """Generate bar chart comparing scaling efficiency across runtimes."""
     fig, ax = plt.subplots(figsize=(10, 6))
     
-    runtimes = list(data.keys())
-    efficiency_data = {rt: calculate_scaling_efficiency(data, rt) for rt in runtimes}
+    runtimes = list(aggs.keys())
+    efficiency_data = {rt: calculate_scaling_efficiency(aggs, rt) for rt in runtimes}
     
     # Get all concurrency levels
     all_concs = set()
@@ -180,18 +177,18 @@ def plot_scaling_efficiency(data, out_path):
     ax.grid(axis='y', alpha=0.3)
     plt.tight_layout()
     
-    plt.savefig(out_path, dpi=300, bbox_inches='tight')
+    plt.savefig(out_path, dpi=PLOT_DPI, bbox_inches='tight')
     print(f"Saved efficiency plot to {out_path}")
     plt.close()
 
 
-def plot_memory_scaling(data, out_path):
+def plot_memory_scaling(plt, aggs, out_path):
     """Generate plot showing memory usage per instance."""
     plt.figure(figsize=(10, 6))
     
-    for rt, conc_map in data.items():
-        concs = sorted(conc_map.keys())
-        means = [statistics.mean(conc_map[c]["avg_rss_kb"]) / 1024 for c in concs]  # Convert to MB
+    for rt, conc_aggs in aggs.items():
+        concs = list(conc_aggs)
+        means = [agg["rss_mean"] / 1024 for agg in conc_aggs.values()]  # Convert to MB
         
         plt.plot(concs, means, marker='s', label=rt, linewidth=2, markersize=8)
     
@@ -202,18 +199,18 @@ def plot_memory_scaling(data, out_path):
     plt.legend(fontsize=10)
     plt.tight_layout()
     
-    plt.savefig(out_path, dpi=300, bbox_inches='tight')
+    plt.savefig(out_path, dpi=PLOT_DPI, bbox_inches='tight')
     print(f"Saved memory plot to {out_path}")
     plt.close()
 
 
-def plot_total_memory_scaling(data, out_path):
+def plot_total_memory_scaling(plt, aggs, out_path):
     """Generate stacked area chart showing total memory consumption."""
     fig, ax = plt.subplots(figsize=(10, 6))
     
-    for rt, conc_map in data.items():
-        concs = sorted(conc_map.keys())
-        total_mem_mb = [statistics.mean(conc_map[c]["total_rss_kb"]) / 1024 for c in concs]
+    for rt, conc_aggs in aggs.items():
+        concs = list(conc_aggs)
+        total_mem_mb = [agg["total_rss_mean"] / 1024 for agg in conc_aggs.values()]
         
         ax.plot(concs, total_mem_mb, marker='o', label=rt, linewidth=2, markersize=8)
     
@@ -224,7 +221,7 @@ def plot_total_memory_scaling(data, out_path):
     ax.legend(fontsize=10)
     plt.tight_layout()
     
-    plt.savefig(out_path, dpi=300, bbox_inches='tight')
+    plt.savefig(out_path, dpi=PLOT_DPI, bbox_inches='tight')
     print(f"Saved total memory plot to {out_path}")
     plt.close()
 
@@ -245,16 +242,19 @@ def main():
         print("  RUNTIME=native ./scripts/measure_http_hello_scaling.sh")
         print("  RUNTIME=docker ./scripts/measure_http_hello_scaling.sh")
         print("  RUNTIME=wasmtime ./scripts/measure_http_hello_scaling.sh")
-        sys.exit(1)
+        return 1
+    
+    aggs = aggregate(data)
     
     # Print text summary
-    print_summary(data)
+    print_summary(aggs)
     
     # Generate plots
-    plot_throughput_vs_concurrency(data, OUT_DIR / "http_hello_scaling_throughput.png")
-    plot_scaling_efficiency(data, OUT_DIR / "http_hello_scaling_efficiency.png")
-    plot_memory_scaling(data, OUT_DIR / "http_hello_scaling_memory_per_instance.png")
-    plot_total_memory_scaling(data, OUT_DIR / "http_hello_scaling_total_memory.png")
+    plt = load_pyplot()
+    plot_throughput_vs_concurrency(plt, aggs, OUT_DIR / "http_hello_scaling_throughput.png")
+    plot_scaling_efficiency(plt, aggs, OUT_DIR / "http_hello_scaling_efficiency.png")
+    plot_memory_scaling(plt, aggs, OUT_DIR / "http_hello_scaling_memory_per_instance.png")
+    plot_total_memory_scaling(plt, aggs, OUT_DIR / "http_hello_scaling_total_memory.png")
     
     print("\n" + "=" * 80)
     print("Analysis complete! Check results/processed/ for plots.")
@@ -262,4 +262,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -4,42 +4,31 @@ Analyze performance differences between stateless and stateful HTTP endpoints.
 Compares latency for / (stateless) vs /state (stateful counter).
 """
 
-import re
-import statistics
 import sys
 from collections import defaultdict
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import numpy as np
 
+from _agg_nb import box_stats
+from _log_parsers import load_parsed, parse_stateful_log, runtime_dirs
+from _plotting import PLOT_DPI, load_pyplot
+
 ROOT_DIR = Path(__file__).resolve().parents[1]
 
-RUNTIMES = {
-    "native": ROOT_DIR / "results" / "raw" / "native" / "http-hello",
-    "docker": ROOT_DIR / "results" / "raw" / "docker" / "http-hello",
-    "wasmtime": ROOT_DIR / "results" / "raw" / "wasmtime" / "http-hello",
-}
+RUNTIMES = runtime_dirs("http-hello", ("native", "docker", "wasmtime"))
 
 OUT_DIR = ROOT_DIR / "results" / "processed"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
-# Regex to match latency lines with optional path field
-LAT_PATTERN = re.compile(r"req=\d+(?:\s+path=([^\s]+))?\s+.*?latency_ms=([0-9.]+)")
-
 
 def load_samples_by_path(log_dir: Path):
     """Load latency samples, separated by endpoint path."""
     by_path = defaultdict(list)
     
-    for log in sorted(log_dir.glob("*_run.log")):
-        with log.open("r") as f:
-            for line in f:
-                m = LAT_PATTERN.search(line)
-                if m:
-                    path = m.group(1) if m.group(1) else "/"  # default to / if no path specified
-                    latency_ms = float(m.group(2))
-                    by_path[path].append(latency_ms)
+    for _, rows in load_parsed(log_dir, parse_stateful_log):
+        for path, latency_ms in rows:
+            by_path[path].append(latency_ms)
     
     return dict(by_path)
 
@@ -51,70 +40,84 @@ def calculate_overhead_pct(stateless_latency, stateful_latency):
     return ((stateful_latency - stateless_latency) / stateless_latency) * 100
 
 
-def print_summary(data):
+def compute_stats(data):
+    """Summarize each runtime's latency samples per endpoint path, once for every consumer.
+
+    Returns {runtime: {path: {"mean", "median", "stdev", "n", "box"}}}, where
+    "box" holds the precomputed ax.bxp stats for the comparison boxplot.
+    """
+    stats = {}
+    for rt, path_data in data.items():
+        rt_stats = stats[rt] = {}
+        for path, samples in path_data.items():
+            arr = np.asarray(samples, dtype=np.float64)
+            box = box_stats(arr)
+            rt_stats[path] = {
+                "mean": arr.mean(),
+                "median": box["med"],
+                "stdev": np.std(arr, ddof=1) if len(arr) > 1 else 0,
+                "n": len(arr),
+                "box": box,
+            }
+    return stats
+
+
+def print_summary(stats):
     """Print text summary comparing stateless vs stateful endpoints."""
     print("\n" + "=" * 80)
     print("STATEFUL VS STATELESS ENDPOINT COMPARISON")
     print("=" * 80)
     
-    for rt, path_data in data.items():
+    for rt, path_stats in stats.items():
         print(f"\n{rt.upper()}:")
         print("-" * 80)
         
-        if "/" in path_data and "/state" in path_data:
-            stateless = path_data["/"]
-            stateful = path_data["/state"]
-            
-            sl_mean = statistics.mean(stateless)
-            sl_median = statistics.median(stateless)
-            sl_stdev = statistics.stdev(stateless) if len(stateless) > 1 else 0
+        if "/" in path_stats and "/state" in path_stats:
+            sl = path_stats["/"]
+            st = path_stats["/state"]
             
-            st_mean = statistics.mean(stateful)
-            st_median = statistics.median(stateful)
-            st_stdev = statistics.stdev(stateful) if len(stateful) > 1 else 0
-            
-            overhead = calculate_overhead_pct(sl_mean, st_mean)
+            overhead = calculate_overhead_pct(sl["mean"], st["mean"])
             
             print(f"  Stateless (/):")
-            print(f"    Mean:   {sl_mean:7.3f} ± {sl_stdev:6.3f} ms")
-            print(f"    Median: {sl_median:7.3f} ms")
-            print(f"    Samples: {len(stateless)}")
+            print(f"    Mean:   {sl['mean']:7.3f} ± {sl['stdev']:6.3f} ms")
+            print(f"    Median: {sl['median']:7.3f} ms")
+            print(f"    Samples: {sl['n']}")
             
             print(f"  Stateful (/state):")
-            print(f"    Mean:   {st_mean:7.3f} ± {st_stdev:6.3f} ms")
-            print(f"    Median: {st_median:7.3f} ms")
-            print(f"    Samples: {len(stateful)}")
+            print(f"    Mean:   {st['mean']:7.3f} ± {st['stdev']:6.3f} ms")
+            print(f"    Median: {st['median']:7.3f} ms")
+            print(f"    Samples: {st['n']}")
             
             print(f"  State Management Overhead: {overhead:+.1f}%")
         else:
-            available = list(path_data.keys())
+            available = list(path_stats.keys())
             print(f"  Paths found: {available}")
-            if "/state" not in path_data:
+            if "/state" not in path_stats:
                 print(f"  [WARN] No /state endpoint data found. Run with PATH_SUFFIX=/state")
 
 
-def plot_comparison_boxplot(data, out_path):
+def plot_comparison_boxplot(plt, stats, out_path):
     """Generate side-by-side boxplot comparing endpoints."""
     fig, ax = plt.subplots(figsize=(12, 6))
     
     positions = []
     labels = []
-    all_data = []
+    boxes = []
     colors = []
     
     pos = 1
-    for rt in sorted(data.keys()):
-        path_data = data[rt]
+    for rt in sorted(stats.keys()):
+        path_stats = stats[rt]
         
-        if "/" in path_data:
-            all_data.append(path_data["/"])
+        if "/" in path_stats:
+            boxes.append(path_stats["/"]["box"])
             positions.append(pos)
             labels.append(f"{rt}\n(stateless)")
             colors.append('lightblue')
             pos += 1
         
-        if "/state" in path_data:
-            all_data.append(path_data["/state"])
+        if "/state" in path_stats:
+            boxes.append(path_stats["/state"]["box"])
             positions.append(pos)
             labels.append(f"{rt}\n(stateful)")
             colors.append('lightcoral')
@@ -122,8 +125,8 @@ def plot_comparison_boxplot(data, out_path):
         
         pos += 0.5  # gap between runtimes
     
-    bp = ax.boxplot(all_data, positions=positions, widths=0.6, 
-                    patch_artist=True, showfliers=True)
+    bp = ax.bxp(boxes, positions=positions, widths=0.6,
+                patch_artist=True, showfliers=True)
     
     for patch, color in zip(bp['boxes'], colors):
         patch.set_facecolor(color)
@@ -144,24 +147,22 @@ def plot_comparison_boxplot(data, out_path):
     ax.legend(handles=legend_elements, loc='upper right')
     
     plt.tight_layout()
-    plt.savefig(out_path, dpi=300, bbox_inches='tight')
+    plt.savefig(out_path, dpi=PLOT_DPI, bbox_inches='tight')
     print(f"\nSaved comparison boxplot to {out_path}")
     plt.close()
 
 
-def plot_overhead_bar_chart(data, out_path):
+def plot_overhead_bar_chart(plt, stats, out_path):
     """Generate bar chart showing state management overhead."""
     fig, ax = plt.subplots(figsize=(10, 6))
     
     runtimes = []
     overheads = []
     
-    for rt in sorted(data.keys()):
-        path_data = data[rt]
-        if "/" in path_data and "/state" in path_data:
-            sl_mean = statistics.mean(path_data["/"])
-            st_mean = statistics.mean(path_data["/state"])
-            overhead = calculate_overhead_pct(sl_mean, st_mean)
+    for rt in sorted(stats.keys()):
+        path_stats = stats[rt]
+        if "/" in path_stats and "/state" in path_stats:
+            overhead = calculate_overhead_pct(path_stats["/"]["mean"], path_stats["/state"]["mean"])
             
             runtimes.append(rt)
             overheads.append(overhead)
@@ -191,7 +192,7 @@ def plot_overhead_bar_chart(data, out_path):
                 fontsize=10, fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig(out_path, dpi=300, bbox_inches='tight')
+    plt.savefig(out_path, dpi=PLOT_DPI, bbox_inches='tight')
     print(f"Saved overhead bar chart to {out_path}")
     plt.close()
 
@@ -211,7 +212,7 @@ def main():
         print("\nMake sure to run benchmarks for both endpoints:")
         print("  ./scripts/measure_native_http_hello.sh  # stateless")
         print("  PATH_SUFFIX=/state ./scripts/measure_native_http_hello.sh  # stateful")
-        sys.exit(1)
+        return 1
     
     # Check if we have stateful data
     has_stateful = any("/state" in path_data for path_data in data.values())
@@ -222,12 +223,15 @@ def main():
         print("  PATH_SUFFIX=/state ./scripts/measure_docker_http_hello.sh")
         print("  PATH_SUFFIX=/state ./scripts/measure_wasmtime_http_hello.sh")
     
+    stats = compute_stats(data)
+    
     # Print summary
-    print_summary(data)
+    print_summary(stats)
     
     # Generate plots
-    plot_comparison_boxplot(data, OUT_DIR / "http_hello_stateful_comparison_boxplot.png")
-    plot_overhead_bar_chart(data, OUT_DIR / "http_hello_state_overhead.png")
+    plt = load_pyplot()
+    plot_comparison_boxplot(plt, stats, OUT_DIR / "http_hello_stateful_comparison_boxplot.png")
+    plot_overhead_bar_chart(plt, stats, OUT_DIR / "http_hello_state_overhead.png")
     
     print("\n" + "=" * 80)
     print("Analysis complete! Check results/processed/ for plots.")
@@ -235,4 +239,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
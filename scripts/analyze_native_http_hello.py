@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
-import re
-import statistics
 from pathlib import Path
 
-import matplotlib.pyplot as plt
+import numpy as np
+
+from _agg_nb import box_stats
+from _log_parsers import load_parsed, parse_run_log
+from _plotting import PLOT_DPI, load_pyplot
 
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
@@ -12,79 +14,30 @@ OUT_DIR = ROOT_DIR / "results" / "processed"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
-RUN_LOG_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2}Z)_run\.log$")
-
-COLD_START_PATTERN = re.compile(r"cold_start_ms=(\d+\.?\d*)")
-LATENCY_PATTERN = re.compile(
-    r"req=(\d+)\s+http_code=(\d{3})\s+latency_ns=(\d+)\s+latency_ms=(\d+\.?\d*)"
-)
-
-
-def parse_run_log(path: Path):
-    """
-    Parse a single *_run.log file.
-
-    Returns:
-        {
-            "run_id": str,
-            "cold_start_ms": float,
-            "latencies_ms": [float, ...],
-        }
-    """
-    m = RUN_LOG_PATTERN.search(path.name)
-    if not m:
-        return None
-    run_id = m.group(1)
-
-    cold_start_ms = None
-    latencies_ms = []
-
-    with path.open("r") as f:
-        for line in f:
-            line = line.strip()
-
-            m_cs = COLD_START_PATTERN.search(line)
-            if m_cs:
-                cold_start_ms = float(m_cs.group(1))
-
-            m_lat = LATENCY_PATTERN.search(line)
-            if m_lat:
-                req_idx = int(m_lat.group(1))
-                http_code = int(m_lat.group(2))
-                latency_ms = float(m_lat.group(4))
-                if http_code == 200:
-                    latencies_ms.append(latency_ms)
-
-    if cold_start_ms is None:
+def check_run(path, parsed):
+    """Return True if the parsed run has a cold start and latency samples, warning otherwise."""
+    if parsed["cold_start_ms"] is None:
         print(f"[WARN] No cold_start_ms found in {path}")
-        return None
+        return False
 
-    if not latencies_ms:
+    if not parsed["latencies_ms"].size:
         print(f"[WARN] No latency lines found in {path}")
-        return None
+        return False
 
-    return {
-        "run_id": run_id,
-        "cold_start_ms": cold_start_ms,
-        "latencies_ms": latencies_ms,
-    }
+    return True
 
 
 def main():
-    run_logs = sorted(RAW_DIR.glob("*_run.log"))
-    if not run_logs:
+    parsed_logs = load_parsed(RAW_DIR, parse_run_log)
+    if not parsed_logs:
         print(f"No run logs found in {RAW_DIR}")
-        return
+        return 1
 
-    runs = []
-    for p in run_logs:
-        parsed = parse_run_log(p)
-        if parsed:
-            runs.append(parsed)
+    runs = [parsed for log, parsed in parsed_logs if parsed and check_run(log, parsed)]
 
     if not runs:
         print("No valid runs parsed.")
-        return
+        return 1
 
     # ---- Print text summary ----
     print("Parsed runs:")
@@ -93,11 +46,13 @@ def main():
         print(
             f"Run {i:02d} ({r['run_id']}): "
             f"cold_start_ms={r['cold_start_ms']:.3f}, "
-            f"latency_ms mean={statistics.mean(lat):.3f}, "
-            f"p50={statistics.median(lat):.3f}, "
-            f"min={min(lat):.3f}, max={max(lat):.3f}"
+            f"latency_ms mean={lat.mean():.3f}, "
+            f"p50={np.median(lat):.3f}, "
+            f"min={lat.min():.3f}, max={lat.max():.3f}"
         )
 
+    plt = load_pyplot()
+
     # ---- Cold start plot ----
     cold_starts = [r["cold_start_ms"] for r in runs]
     run_indices = list(range(1, len(runs) + 1))
@@ -109,22 +64,22 @@ def main():
     plt.title("Native http-hello cold start per run")
     plt.grid(True)
     cold_start_png = OUT_DIR / "native_http_hello_cold_start_ms.png"
-    plt.savefig(cold_start_png, bbox_inches="tight")
+    plt.savefig(cold_start_png, dpi=PLOT_DPI, bbox_inches="tight")
     print(f"Saved cold start plot to {cold_start_png}")
+    plt.close()
 
     # ---- Latency distribution plot (all runs combined) ----
-    all_latencies = []
-    for r in runs:
-        all_latencies.extend(r["latencies_ms"])
+    all_latencies = np.concatenate([r["latencies_ms"] for r in runs])
 
     plt.figure()
-    plt.boxplot(all_latencies, vert=True, showfliers=True)
+    plt.gca().bxp([box_stats(all_latencies)], showfliers=True)
     plt.ylabel("Latency (ms)")
     plt.title("Native http-hello request latency (all runs)")
     plt.grid(True, axis="y")
     latency_box_png = OUT_DIR / "native_http_hello_latency_boxplot_ms.png"
-    plt.savefig(latency_box_png, bbox_inches="tight")
+    plt.savefig(latency_box_png, dpi=PLOT_DPI, bbox_inches="tight")
     print(f"Saved latency boxplot to {latency_box_png}")
+    plt.close()
 
     # ---- Optional: per-run latency scatter ----
     plt.figure()
@@ -136,9 +91,11 @@ def main():
     plt.title("Native http-hello per-run latency scatter")
     plt.grid(True, axis="y")
     latency_scatter_png = OUT_DIR / "native_http_hello_latency_scatter_ms.png"
-    plt.savefig(latency_scatter_png, bbox_inches="tight")
+    plt.savefig(latency_scatter_png, dpi=PLOT_DPI, bbox_inches="tight")
     print(f"Saved latency scatter to {latency_scatter_png}")
+    plt.close()
 
 
 if __name__ == "__main__":
+    # Exit 0 without data so run_all_benchmarks.sh keeps going; analyze_all.py reads main()'s 1
     main()
@@ -3,7 +3,8 @@ import re
 import statistics
 from pathlib import Path
 
-import matplotlib.pyplot as plt
+from _log_index import list_run_logs
+from _plotting import PLOT_DPI, load_pyplot
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 
@@ -15,20 +16,16 @@ RUNTIMES = {
 OUT_DIR = ROOT_DIR / "results" / "processed"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
-RUN_LOG_PATTERN = re.compile(r".*_run\.log$")
-ELAPSED_MS_PATTERN = re.compile(r"elapsed_ms=([0-9.]+)")
+
+# Matched against the raw log bytes; only the captured numbers are decoded
+ELAPSED_MS_PATTERN = re.compile(rb"elapsed_ms=([0-9.]+)")
 
 
 def load_samples(path: Path):
     samples = []
-    for log in sorted(path.glob("*_run.log")):
-        if not RUN_LOG_PATTERN.match(log.name):
-            continue
-        with log.open("r") as f:
-            for line in f:
-                m = ELAPSED_MS_PATTERN.search(line)
-                if m:
-                    samples.append(float(m.group(1)))
+    for log in list_run_logs(path):
+        with open(log, "rb") as f:
+            samples.extend(map(float, ELAPSED_MS_PATTERN.findall(f.read())))
     return samples
 
 
@@ -43,12 +40,12 @@ def main():
 
     if not data:
         print("No hello-wasm data found.")
-        return
+        return 1
 
     print("hello-wasm summary (elapsed_ms):")
     for rt, samples in data.items():
         print(
-            f"- {rt}: mean={statistics.mean(samples):.3f} ms, "
+            f"- {rt}: mean={statistics.fmean(samples):.3f} ms, "
             f"p50={statistics.median(samples):.3f} ms, "
             f"min={min(samples):.3f}, max={max(samples):.3f}, n={len(samples)}"
         )
@@ -56,16 +53,18 @@ def main():
     labels = list(data.keys())
     series = [data[k] for k in labels]
 
+    plt = load_pyplot()
     plt.figure()
     plt.boxplot(series, tick_labels=labels, showfliers=True)
     plt.ylabel("Execution time (ms)")
     plt.title("hello-wasm execution time by runtime")
     plt.grid(axis="y", alpha=0.3)
     out_box = OUT_DIR / "hello_wasm_elapsed_ms_boxplot.png"
-    plt.savefig(out_box, bbox_inches="tight")
+    plt.savefig(out_box, dpi=PLOT_DPI, bbox_inches="tight")
     print(f"Saved boxplot to {out_box}")
+    plt.close()
 
-    means = [statistics.mean(s) for s in series]
+    means = [statistics.fmean(s) for s in series]
     x = range(len(labels))
 
     plt.figure()
@@ -75,9 +74,11 @@ def main():
     plt.title("hello-wasm mean execution time by runtime")
     plt.grid(axis="y", alpha=0.3)
     out_bar = OUT_DIR / "hello_wasm_elapsed_ms_bar.png"
-    plt.savefig(out_bar, bbox_inches="tight")
+    plt.savefig(out_bar, dpi=PLOT_DPI, bbox_inches="tight")
     print(f"Saved bar chart to {out_bar}")
+    plt.close()
 
 
 if __name__ == "__main__":
+    # Exit 0 without data so run_all_benchmarks.sh keeps going; analyze_all.py reads main()'s 1
     main()
@@ -4,306 +4,387 @@ Generate comprehensive summary report of all benchmark results.
 Creates markdown tables, LaTeX tables, and executive summary.
 """
 
+import array
+import io
+import os
 import re
-import statistics
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from _agg_nb import agg_stats
+from _log_index import RAW_DIR, list_run_logs
+from _log_parsers import map_log, runtime_dirs
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 OUT_DIR = ROOT_DIR / "results" / "processed"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
+MARKDOWN_PATH = OUT_DIR / "benchmark_summary.md"
+LATEX_PATH = OUT_DIR / "benchmark_summary.tex"
+EXEC_PATH = OUT_DIR / "executive_summary.txt"
+# Input paths the reports were built from, one per line; a changed set forces a rebuild
+MANIFEST_PATH = OUT_DIR / ".summary_inputs"
+
+# This script and the helper modules whose code shapes the reports
+SCRIPT_INPUTS = tuple(
+    str(Path(__file__).resolve().with_name(name))
+    for name in ("generate_summary.py", "_agg_nb.py", "_log_index.py", "_log_parsers.py")
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Benchmark:
+    key: str
+    name: str
+    unit: str
+    runtimes: Tuple[Tuple[str, Path], ...]  # (runtime, log directory) pairs
+    pattern: re.Pattern
+    scale: Optional[float] = None  # applied to the parsed values as one array multiply
+    sorted_runtimes: Tuple[str, ...] = field(init=False)  # report order, fixed at import
+    
+    def __post_init__(self):
+        object.__setattr__(self, "sorted_runtimes", tuple(sorted(rt for rt, _ in self.runtimes)))
+    
+    def runtimes_in(self, bench_results: Dict) -> List[str]:
+        """Return the runtimes that have results, in report order."""
+        return [rt for rt in self.sorted_runtimes if rt in bench_results]
+
+
+HTTP_HELLO_DIRS = tuple(runtime_dirs("http-hello", ("native", "docker", "wasmtime")).items())
+
 # Define all benchmarks and their data locations
-BENCHMARKS = {
-    "cold_start": {
-        "name": "Cold Start",
-        "unit": "ms",
-        "runtimes": {
-            "native": ROOT_DIR / "results" / "raw" / "native" / "http-hello",
-            "docker": ROOT_DIR / "results" / "raw" / "docker" / "http-hello",
-            "wasmtime": ROOT_DIR / "results" / "raw" / "wasmtime" / "http-hello",
-        },
-        "pattern": re.compile(r"cold_start_ms=([0-9.]+)"),
-    },
-    "http_latency": {
-        "name": "HTTP Latency (p50)",
-        "unit": "ms",
-        "runtimes": {
-            "native": ROOT_DIR / "results" / "raw" / "native" / "http-hello",
-            "docker": ROOT_DIR / "results" / "raw" / "docker" / "http-hello",
-            "wasmtime": ROOT_DIR / "results" / "raw" / "wasmtime" / "http-hello",
-        },
-        "pattern": re.compile(r"latency_ms=([0-9.]+)"),
-    },
-    "http_throughput": {
-        "name": "HTTP Throughput",
-        "unit": "req/s",
-        "runtimes": {
-            "native": ROOT_DIR / "results" / "raw" / "native" / "http-hello",
-            "docker": ROOT_DIR / "results" / "raw" / "docker" / "http-hello",
-            "wasmtime": ROOT_DIR / "results" / "raw" / "wasmtime" / "http-hello",
-        },
-        "pattern": re.compile(r"throughput_rps=([0-9.]+)"),
-    },
-    "memory_usage": {
-        "name": "Memory Usage",
-        "unit": "MB",
-        "runtimes": {
-            "native": ROOT_DIR / "results" / "raw" / "native" / "http-hello",
-            "docker": ROOT_DIR / "results" / "raw" / "docker" / "http-hello",
-            "wasmtime": ROOT_DIR / "results" / "raw" / "wasmtime" / "http-hello",
-        },
-        "pattern": re.compile(r"rss_kb=([0-9.]+)"),
-        "convert": lambda x: x / 1024,  # KB to MB
-    },
-    "cpu_hash": {
-        "name": "CPU Hash Performance",
-        "unit": "ms",
-        "runtimes": {
-            "native": ROOT_DIR / "results" / "raw" / "native" / "cpu-hash",
-            "docker": ROOT_DIR / "results" / "raw" / "docker" / "cpu-hash",
-            "wasmtime": ROOT_DIR / "results" / "raw" / "wasm" / "cpu-hash",
-            "wasmedge": ROOT_DIR / "results" / "raw" / "wasmedge" / "cpu-hash",
-        },
-        "pattern": re.compile(r"outer_ms=([0-9.]+)"),
-    },
-}
-
-
-def load_samples(log_dir: Path, pattern: re.Pattern, convert_func=None):
-    """Load samples from log files matching the pattern."""
-    samples = []
+BENCHMARKS = (
+    Benchmark(
+        key="cold_start",
+        name="Cold Start",
+        unit="ms",
+        runtimes=HTTP_HELLO_DIRS,
+        pattern=re.compile(rb"cold_start_ms=([0-9.]+)"),
+    ),
+    Benchmark(
+        key="http_latency",
+        name="HTTP Latency (p50)",
+        unit="ms",
+        runtimes=HTTP_HELLO_DIRS,
+        pattern=re.compile(rb"latency_ms=([0-9.]+)"),
+    ),
+    Benchmark(
+        key="http_throughput",
+        name="HTTP Throughput",
+        unit="req/s",
+        runtimes=HTTP_HELLO_DIRS,
+        pattern=re.compile(rb"throughput_rps=([0-9.]+)"),
+    ),
+    Benchmark(
+        key="memory_usage",
+        name="Memory Usage",
+        unit="MB",
+        runtimes=HTTP_HELLO_DIRS,
+        pattern=re.compile(rb"rss_kb=([0-9.]+)"),
+        scale=1 / 1024,  # KB to MB
+    ),
+    Benchmark(
+        key="cpu_hash",
+        name="CPU Hash Performance",
+        unit="ms",
+        runtimes=(
+            ("native", RAW_DIR / "native" / "cpu-hash"),
+            ("docker", RAW_DIR / "docker" / "cpu-hash"),
+            ("wasmtime", RAW_DIR / "wasm" / "cpu-hash"),
+            ("wasmedge", RAW_DIR / "wasmedge" / "cpu-hash"),
+        ),
+        pattern=re.compile(rb"outer_ms=([0-9.]+)"),
+    ),
+)
+BENCHMARKS_BY_KEY = {bench.key: bench for bench in BENCHMARKS}
+
+
+def load_samples(log_dir: Path, metrics: List):
+    """Load samples for several (bytes pattern, scale) metrics from the same logs.
+
+    The patterns are fused into one named-group alternation, so each log is
+    mapped once and scanned in place in a single pass; no copy, line
+    splitting or decoding. Logs containing none of the patterns' literal
+    prefixes (e.g. aborted runs) are rejected with a substring search first.
+    Returns one float64 sample array per metric, in order.
+    """
+    # Unboxed doubles while scanning; each returned ndarray shares its array's buffer
+    samples = [array.array("d") for _ in metrics]
     
-    if not log_dir.exists():
-        return samples
+    # Group m<i> wraps metric i's pattern; its value is the next group
+    targets = {}
+    parts = []
+    for i, ((pattern, _), out) in enumerate(zip(metrics, samples)):
+        targets[f"m{i}"] = out.append
+        parts.append(b"(?P<m%d>%s)" % (i, pattern.pattern))
+    combined = re.compile(b"|".join(parts))
+    # Literal text before each pattern's value group, e.g. b"cold_start_ms="
+    anchors = [pattern.pattern.partition(b"(")[0] for pattern, _ in metrics]
     
-    for log in sorted(log_dir.glob("*_run.log")):
-        with log.open("r") as f:
-            for line in f:
-                m = pattern.search(line)
-                if m:
-                    value = float(m.group(1))
-                    if convert_func:
-                        value = convert_func(value)
-                    samples.append(value)
+    for log in list_run_logs(log_dir):
+        with map_log(log) as buf:
+            if all(buf.find(anchor) == -1 for anchor in anchors):
+                continue
+            for m in combined.finditer(buf):
+                targets[m.lastgroup](float(m.group(m.lastindex + 1)))
     
-    return samples
+    arrays = []
+    for (_, scale), out in zip(metrics, samples):
+        arr = np.frombuffer(out, dtype=np.float64)
+        if scale:
+            arr *= scale
+        arrays.append(arr)
+    return arrays
 
 
-def calculate_percentile(samples: List[float], percentile: int) -> float:
-    """Calculate the specified percentile."""
-    if not samples:
-        return 0.0
-    sorted_samples = sorted(samples)
-    index = int(len(sorted_samples) * percentile / 100)
-    return sorted_samples[min(index, len(sorted_samples) - 1)]
+class Stats(NamedTuple):
+    mean: float
+    median: float
+    stdev: float
+    min: float
+    max: float
+    n: int
 
 
-def generate_markdown_table(results: Dict) -> str:
-    """Generate markdown comparison table."""
-    lines = []
-    lines.append("# Benchmark Summary\n")
-    lines.append("## Performance Comparison\n")
+def summarize(arr: np.ndarray) -> Stats:
+    """Compute every statistic the reports use in one agg_stats call (numba-compiled with USE_NUMBA=1)."""
+    mean, median, lo, hi, stdev = agg_stats(arr)
+    return Stats(mean=mean, median=median, stdev=stdev, min=lo, max=hi, n=arr.size)
+
+
+# Bound str.format methods for the per-runtime table rows, parsed once at import
+_MARKDOWN_ROW = "| {} | {:.2f} {unit} | {:.2f} {unit} | {:.2f} | {:.2f} | {:.2f} | {} |\n".format
+_LATEX_ROW = "{} & {:.2f} & {:.2f} & {:.2f} & {:.2f} \\\\\n".format
+
+
+def render_all(summaries: Dict) -> Tuple[str, str, str]:
+    """Render the markdown table, LaTeX table and executive summary.
+
+    Both tables are filled in a single traversal of the summaries, each row's
+    Stats formatted into the two buffers back to back. The executive summary
+    only picks a few means out of its own sections, so it keeps its own function.
+    """
+    md = io.StringIO()
+    tex = io.StringIO()
+    md_w = md.write
+    tex_w = tex.write
     
-    for benchmark_key, benchmark_info in BENCHMARKS.items():
-        if benchmark_key not in results:
-            continue
-        
-        bench_results = results[benchmark_key]
+    md_w("# Benchmark Summary\n\n")
+    md_w("## Performance Comparison\n\n")
+    tex_w("\\begin{table}[h]\n")
+    tex_w("\\centering\n")
+    tex_w("\\caption{Benchmark Results Summary}\n")
+    tex_w("\\label{tab:benchmark_summary}\n")
+    
+    for bench in BENCHMARKS:
+        bench_results = summaries.get(bench.key)
         if not bench_results:
             continue
         
-        lines.append(f"### {benchmark_info['name']}\n")
-        lines.append(f"| Runtime | Mean | Median | Std Dev | Min | Max | Samples |")
-        lines.append(f"|---------|------|--------|---------|-----|-----|---------|")
+        unit = bench.unit
+        runtimes = bench.runtimes_in(bench_results)
         
-        for rt in sorted(bench_results.keys()):
-            samples = bench_results[rt]
-            if not samples:
-                continue
-            
-            mean_val = statistics.mean(samples)
-            median_val = statistics.median(samples)
-            stdev_val = statistics.stdev(samples) if len(samples) > 1 else 0
-            min_val = min(samples)
-            max_val = max(samples)
-            n = len(samples)
-            unit = benchmark_info['unit']
-            
-            lines.append(
-                f"| {rt} | {mean_val:.2f} {unit} | {median_val:.2f} {unit} | "
-                f"{stdev_val:.2f} | {min_val:.2f} | {max_val:.2f} | {n} |"
-            )
+        md_w(f"### {bench.name}\n\n")
+        md_w("| Runtime | Mean | Median | Std Dev | Min | Max | Samples |\n")
+        md_w("|---------|------|--------|---------|-----|-----|---------|\n")
+        tex_w("\\begin{tabular}{l" + "r" * 4 + "}\n")
+        tex_w("\\hline\n")
+        tex_w(f"\\multicolumn{{5}}{{c}}{{\\textbf{{{bench.name}}}}} \\\\\n")
+        tex_w("\\hline\n")
+        tex_w("Runtime & Mean & Median & Std Dev & Min \\\\\n")
+        tex_w("\\hline\n")
+        
+        for rt in runtimes:
+            st = bench_results[rt]
+            md_w(_MARKDOWN_ROW(rt, st.mean, st.median, st.stdev, st.min, st.max, st.n, unit=unit))
+            tex_w(_LATEX_ROW(rt, st.mean, st.median, st.stdev, st.min))
         
         # Calculate speedup relative to Docker
-        if "docker" in bench_results and len(bench_results["docker"]) > 0:
-            docker_mean = statistics.mean(bench_results["docker"])
-            lines.append(f"\n**Speedup vs Docker:**\n")
-            for rt in sorted(bench_results.keys()):
-                if rt == "docker" or not bench_results[rt]:
+        if "docker" in bench_results:
+            docker_mean = bench_results["docker"].mean
+            md_w("\n**Speedup vs Docker:**\n\n")
+            for rt in runtimes:
+                if rt == "docker":
                     continue
-                rt_mean = statistics.mean(bench_results[rt])
+                rt_mean = bench_results[rt].mean
                 # For latency/time metrics, lower is better
                 if unit in ["ms", "s"]:
                     speedup = docker_mean / rt_mean
                 else:  # For throughput, higher is better
                     speedup = rt_mean / docker_mean
-                lines.append(f"- {rt}: {speedup:.2f}x")
+                md_w(f"- {rt}: {speedup:.2f}x\n")
         
-        lines.append("\n")
+        md_w("\n\n")
+        tex_w("\\hline\n")
+        tex_w("\\end{tabular}\n")
+        tex_w("\\vspace{1em}\n\n")
+    
+    tex_w("\\end{table}\n")
     
-    return "\n".join(lines)
+    return _strip_last_newline(md.getvalue()), _strip_last_newline(tex.getvalue()), generate_executive_summary(summaries)
 
 
-def generate_latex_table(results: Dict) -> str:
-    """Generate LaTeX table for report."""
-    lines = []
-    lines.append("\\begin{table}[h]")
-    lines.append("\\centering")
-    lines.append("\\caption{Benchmark Results Summary}")
-    lines.append("\\label{tab:benchmark_summary}")
-    
-    for benchmark_key, benchmark_info in BENCHMARKS.items():
-        if benchmark_key not in results:
-            continue
-        
-        bench_results = results[benchmark_key]
-        if not bench_results:
-            continue
-        
-        runtimes = sorted(bench_results.keys())
-        lines.append("\\begin{tabular}{l" + "r" * 4 + "}")
-        lines.append("\\hline")
-        lines.append(f"\\multicolumn{{5}}{{c}}{{\\textbf{{{benchmark_info['name']}}}}} \\\\")
-        lines.append("\\hline")
-        lines.append(f"Runtime & Mean & Median & Std Dev & Min \\\\")
-        lines.append("\\hline")
-        
-        for rt in runtimes:
-            samples = bench_results[rt]
-            if not samples:
-                continue
-            
-            mean_val = statistics.mean(samples)
-            median_val = statistics.median(samples)
-            stdev_val = statistics.stdev(samples) if len(samples) > 1 else 0
-            min_val = min(samples)
-            unit = benchmark_info['unit']
-            
-            lines.append(
-                f"{rt} & {mean_val:.2f} & {median_val:.2f} & "
-                f"{stdev_val:.2f} & {min_val:.2f} \\\\"
-            )
-        
-        lines.append("\\hline")
-        lines.append("\\end{tabular}")
-        lines.append("\\vspace{1em}\n")
-    
-    lines.append("\\end{table}")
-    
-    return "\n".join(lines)
+def _strip_last_newline(text: str) -> str:
+    """Drop the final newline; the reports have always ended as "\\n".join(lines) left them."""
+    return text[:-1] if text.endswith("\n") else text
 
 
-def generate_executive_summary(results: Dict) -> str:
+def generate_executive_summary(summaries: Dict) -> str:
     """Generate concise executive summary."""
-    lines = []
-    lines.append("=" * 80)
-    lines.append("WASM BENCHMARK EXECUTIVE SUMMARY")
-    lines.append("=" * 80)
-    lines.append("")
+    buf = io.StringIO()
+    w = buf.write
+    w("=" * 80 + "\n")
+    w("WASM BENCHMARK EXECUTIVE SUMMARY\n")
+    w("=" * 80 + "\n")
+    w("\n")
     
     # Key findings
-    lines.append("KEY FINDINGS:")
-    lines.append("-" * 80)
+    w("KEY FINDINGS:\n")
+    w("-" * 80 + "\n")
     
     # Cold start comparison
-    if "cold_start" in results:
-        cold_start = results["cold_start"]
+    if "cold_start" in summaries:
+        cold_start = summaries["cold_start"]
         if "native" in cold_start and "docker" in cold_start and "wasmtime" in cold_start:
-            native_cs = statistics.mean(cold_start["native"])
-            docker_cs = statistics.mean(cold_start["docker"])
-            wasm_cs = statistics.mean(cold_start["wasmtime"])
+            native_cs = cold_start["native"].mean
+            docker_cs = cold_start["docker"].mean
+            wasm_cs = cold_start["wasmtime"].mean
             
-            lines.append(f"\n1. Cold Start Performance:")
-            lines.append(f"   - Native:   {native_cs:6.2f} ms (fastest)")
-            lines.append(f"   - Docker:   {docker_cs:6.2f} ms ({docker_cs/native_cs:.2f}x slower)")
-            lines.append(f"   - Wasmtime: {wasm_cs:6.2f} ms ({wasm_cs/native_cs:.2f}x slower)")
+            w(f"\n1. Cold Start Performance:\n")
+            w(f"   - Native:   {native_cs:6.2f} ms (fastest)\n")
+            w(f"   - Docker:   {docker_cs:6.2f} ms ({docker_cs/native_cs:.2f}x slower)\n")
+            w(f"   - Wasmtime: {wasm_cs:6.2f} ms ({wasm_cs/native_cs:.2f}x slower)\n")
     
     # HTTP throughput
-    if "http_throughput" in results:
-        throughput = results["http_throughput"]
+    if "http_throughput" in summaries:
+        throughput = summaries["http_throughput"]
         if throughput:
-            lines.append(f"\n2. HTTP Throughput:")
-            for rt in sorted(throughput.keys()):
-                if throughput[rt]:
-                    mean_tp = statistics.mean(throughput[rt])
-                    lines.append(f"   - {rt:10s}: {mean_tp:8.1f} req/s")
+            w(f"\n2. HTTP Throughput:\n")
+            for rt in BENCHMARKS_BY_KEY["http_throughput"].runtimes_in(throughput):
+                w(f"   - {rt:10s}: {throughput[rt].mean:8.1f} req/s\n")
     
     # Memory efficiency
-    if "memory_usage" in results:
-        memory = results["memory_usage"]
+    if "memory_usage" in summaries:
+        memory = summaries["memory_usage"]
         if memory:
-            lines.append(f"\n3. Memory Usage:")
-            for rt in sorted(memory.keys()):
-                if memory[rt]:
-                    mean_mem = statistics.mean(memory[rt])
-                    lines.append(f"   - {rt:10s}: {mean_mem:6.1f} MB")
+            w(f"\n3. Memory Usage:\n")
+            for rt in BENCHMARKS_BY_KEY["memory_usage"].runtimes_in(memory):
+                w(f"   - {rt:10s}: {memory[rt].mean:6.1f} MB\n")
     
     # CPU performance
-    if "cpu_hash" in results:
-        cpu = results["cpu_hash"]
+    if "cpu_hash" in summaries:
+        cpu = summaries["cpu_hash"]
         if cpu and "native" in cpu:
-            native_cpu = statistics.mean(cpu["native"])
-            lines.append(f"\n4. CPU-Bound Performance (relative to native):")
-            for rt in sorted(cpu.keys()):
-                if cpu[rt] and rt != "native":
-                    rt_cpu = statistics.mean(cpu[rt])
+            native_cpu = cpu["native"].mean
+            w(f"\n4. CPU-Bound Performance (relative to native):\n")
+            for rt in BENCHMARKS_BY_KEY["cpu_hash"].runtimes_in(cpu):
+                if rt != "native":
+                    rt_cpu = cpu[rt].mean
                     overhead = ((rt_cpu / native_cpu) - 1) * 100
-                    lines.append(f"   - {rt:10s}: {overhead:+5.1f}% overhead")
+                    w(f"   - {rt:10s}: {overhead:+5.1f}% overhead\n")
     
-    lines.append("\n" + "=" * 80)
+    w("\n" + "=" * 80 + "\n")
     
-    return "\n".join(lines)
+    return _strip_last_newline(buf.getvalue())
+
+
+def summary_inputs() -> List[str]:
+    """Return the sorted paths the reports depend on.
+
+    Inputs are this script and its helper modules, the benchmark log
+    directories that exist (so a removed log counts as a change) and the run
+    logs in them.
+    """
+    inputs = list(SCRIPT_INPUTS)
+    for log_dir in {log_dir for bench in BENCHMARKS for _, log_dir in bench.runtimes}:
+        if log_dir.is_dir():
+            inputs.append(str(log_dir))
+            inputs.extend(list_run_logs(log_dir))
+    return sorted(inputs)
+
+
+def reports_up_to_date(inputs: List[str]) -> bool:
+    """Return True if all three reports are newer than every input and were built from the same inputs.
+
+    Comparing against the manifest catches inputs that disappeared, such as
+    a deleted runtime directory, which no mtime check can see.
+    """
+    try:
+        oldest_report = min(p.stat().st_mtime_ns for p in (MARKDOWN_PATH, LATEX_PATH, EXEC_PATH))
+        manifest = MANIFEST_PATH.read_text()
+    except FileNotFoundError:
+        return False
+    
+    if manifest != "\n".join(inputs):
+        return False
+    return all(os.stat(p).st_mtime_ns < oldest_report for p in inputs)
 
 
 def main():
+    inputs = summary_inputs()
+    if reports_up_to_date(inputs):
+        print(f"Summary reports in {OUT_DIR} are newer than every benchmark log; nothing to regenerate.")
+        print("Delete them or touch a log to force a rebuild.")
+        return
+    
     print("Collecting benchmark results...")
     
-    results = {}
+    # Several benchmarks read the same http-hello logs; group them so each directory is read once
+    by_dir = defaultdict(list)
+    for bench in BENCHMARKS:
+        for rt, log_dir in bench.runtimes:
+            by_dir[log_dir].append((bench.key, rt, bench.pattern, bench.scale))
+    
+    # Directories are independent; threads overlap their file reads
+    with ThreadPoolExecutor() as ex:
+        futures = [
+            ex.submit(load_samples, log_dir, [(pattern, scale) for _, _, pattern, scale in metrics])
+            for log_dir, metrics in by_dir.items()
+        ]
+    
+    loaded = {}
+    for metrics, fut in zip(by_dir.values(), futures):
+        for (benchmark_key, rt, _, _), samples in zip(metrics, fut.result()):
+            loaded[benchmark_key, rt] = samples
     
-    for benchmark_key, benchmark_info in BENCHMARKS.items():
-        results[benchmark_key] = {}
+    # Summarized once here; all three reports read the same Stats
+    summaries = {}
+    
+    for bench in BENCHMARKS:
+        summaries[bench.key] = {}
         
-        for rt, log_dir in benchmark_info["runtimes"].items():
-            convert_func = benchmark_info.get("convert", None)
-            samples = load_samples(log_dir, benchmark_info["pattern"], convert_func)
+        for rt, _ in bench.runtimes:
+            samples = loaded[bench.key, rt]
             
-            if samples:
-                results[benchmark_key][rt] = samples
-                print(f"  {benchmark_key} / {rt}: {len(samples)} samples")
+            if samples.size:
+                summaries[bench.key][rt] = summarize(samples)
+                print(f"  {bench.key} / {rt}: {len(samples)} samples")
     
     # Generate outputs
     print("\nGenerating summary reports...")
     
+    markdown, latex, exec_summary = render_all(summaries)
+    
     # Markdown summary
-    markdown = generate_markdown_table(results)
-    markdown_path = OUT_DIR / "benchmark_summary.md"
-    markdown_path.write_text(markdown)
-    print(f"  ✓ Markdown summary: {markdown_path}")
+    MARKDOWN_PATH.write_text(markdown)
+    print(f"  ✓ Markdown summary: {MARKDOWN_PATH}")
     
     # LaTeX table
-    latex = generate_latex_table(results)
-    latex_path = OUT_DIR / "benchmark_summary.tex"
-    latex_path.write_text(latex)
-    print(f"  ✓ LaTeX table: {latex_path}")
+    LATEX_PATH.write_text(latex)
+    print(f"  ✓ LaTeX table: {LATEX_PATH}")
     
     # Executive summary (to stdout and file)
-    exec_summary = generate_executive_summary(results)
-    exec_path = OUT_DIR / "executive_summary.txt"
-    exec_path.write_text(exec_summary)
-    print(f"  ✓ Executive summary: {exec_path}")
+    EXEC_PATH.write_text(exec_summary)
+    print(f"  ✓ Executive summary: {EXEC_PATH}")
+    
+    # Written last, so an interrupted run is rebuilt next time
+    MANIFEST_PATH.write_text("\n".join(inputs))
     
     print("\n" + exec_summary)
     
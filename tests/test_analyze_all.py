@@ -0,0 +1,55 @@
+import contextlib
+import io
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import analyze_all  # noqa: E402
+
+
+def fake_analysis(main):
+    module = types.ModuleType("fake")
+    module.main = main
+    return module
+
+
+def raise_(exc):
+    raise exc
+
+
+class RunAnalysesTest(unittest.TestCase):
+    def run_main(self, analyses):
+        modules = {name: fake_analysis(main) for name, main in analyses.items()}
+        out = io.StringIO()
+        with mock.patch.dict(sys.modules, modules), mock.patch.object(analyze_all, "ANALYSES", list(analyses)):
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+                rc = analyze_all.main()
+        return rc, out.getvalue()
+
+    def test_all_succeeding(self):
+        rc, out = self.run_main({"fake_ok": lambda: None, "fake_zero": lambda: 0})
+        self.assertEqual(rc, 0)
+        self.assertNotIn("[WARN]", out)
+
+    def test_failures_are_reported_and_later_analyses_still_run(self):
+        ran = []
+        rc, out = self.run_main({
+            "fake_no_data": lambda: 1,
+            "fake_exit": lambda: raise_(SystemExit(2)),
+            "fake_error": lambda: raise_(ValueError("boom")),
+            "fake_ok": lambda: ran.append(True),
+        })
+        self.assertEqual(rc, 1)
+        self.assertEqual(ran, [True])
+        self.assertIn("fake_no_data (no usable data)", out)
+        self.assertIn("fake_exit (exit status 2)", out)
+        self.assertIn("fake_error (raised an exception)", out)
+        self.assertNotIn("fake_ok (", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import analyze_cold_start_comparison as cold_start  # noqa: E402
+
+HEADER = b"runtime,type,run,build_ms,start_ms,total_ms\n"
+ROWS = [
+    b"docker,runtime_cold,1,0,500.0,500.0\n",
+    b"wasmtime,runtime_cold,1,0,200.0,200.0\n",
+    b"wasmtime,runtime_cold,2,0,250.0,250.0",  # no trailing newline
+]
+
+
+class LoadDataTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.csv = Path(tmp.name) / "cold_start_data.csv"
+        for name, value in (("CSV_FILE", self.csv), ("CSV_STATE", Path(tmp.name) / "state.pkl")):
+            patcher = mock.patch.object(cold_start, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def load(self):
+        return {key: {col: arr.tolist() for col, arr in cols.items()} for key, cols in cold_start.load_data().items()}
+
+    def test_unterminated_last_row_survives_warm_rerun(self):
+        self.csv.write_bytes(HEADER + b"".join(ROWS))
+        first = self.load()
+        self.assertEqual(first["wasmtime_runtime_cold"]["start_ms"], [200.0, 250.0])
+        self.assertEqual(self.load(), first)
+
+    def test_appended_rows_are_picked_up(self):
+        self.csv.write_bytes(HEADER + b"".join(ROWS[:2]))
+        self.load()
+        self.csv.write_bytes(HEADER + b"".join(ROWS))
+        self.assertEqual(self.load()["wasmtime_runtime_cold"]["run"], [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import generate_summary  # noqa: E402
+from generate_summary import Stats  # noqa: E402
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+
+# Fixed per-runtime means; the other statistics are derived from them
+MEANS = {
+    "cold_start": {"native": 2.0, "docker": 450.0, "wasmtime": 12.5},
+    "http_latency": {"native": 0.25, "docker": 0.5, "wasmtime": 0.4},
+    "http_throughput": {"native": 4000.0, "docker": 2500.0, "wasmtime": 3200.0},
+    "memory_usage": {"native": 3.5, "docker": 42.0, "wasmtime": 18.25},
+    "cpu_hash": {"native": 100.0, "docker": 102.0, "wasmtime": 125.0, "wasmedge": 140.0},
+}
+
+
+def fixed_summaries():
+    return {
+        key: {
+            rt: Stats(mean=mean, median=mean * 0.98, stdev=mean / 10, min=mean / 2, max=mean * 2, n=30)
+            for rt, mean in by_rt.items()
+        }
+        for key, by_rt in MEANS.items()
+    }
+
+
+class RenderAllTest(unittest.TestCase):
+    def test_reports_match_golden_files(self):
+        rendered = generate_summary.render_all(fixed_summaries())
+        names = ("benchmark_summary.md", "benchmark_summary.tex", "executive_summary.txt")
+        for name, text in zip(names, rendered):
+            with self.subTest(name=name):
+                # Bytes comparison so a changed trailing newline fails too
+                self.assertEqual(text.encode(), (GOLDEN_DIR / name).read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
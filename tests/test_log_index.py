@@ -0,0 +1,51 @@
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import _log_index  # noqa: E402
+
+
+class ListRunLogsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.raw = self.root / "raw"
+        for name, value in (
+            ("RAW_DIR", self.raw),
+            ("INDEX_CACHE", self.root / "index.pkl"),
+            ("_index", None),
+        ):
+            patcher = mock.patch.object(_log_index, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_concurrent_lookups_and_rescans(self):
+        dirs = []
+        for d in range(16):
+            log_dir = self.raw / f"runtime{d}" / "http-hello"
+            log_dir.mkdir(parents=True)
+            (log_dir / "2024-01-01T00-00-00Z_run.log").touch()
+            dirs.append(log_dir)
+        _log_index.list_run_logs(dirs[0])  # builds and saves the index
+        for log_dir in dirs:  # every directory now needs a rescan
+            (log_dir / "2024-01-02T00-00-00Z_run.log").touch()
+
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            results = list(ex.map(_log_index.list_run_logs, dirs * 4))
+
+        for log_dir, logs in zip(dirs * 4, results):
+            self.assertEqual([Path(p).name for p in logs], ["2024-01-01T00-00-00Z_run.log", "2024-01-02T00-00-00Z_run.log"])
+            self.assertEqual(Path(logs[0]).parent, log_dir)
+        saved = _log_index._load_index()
+        self.assertEqual(len(saved[str(dirs[-1])][1]), 2)
+        self.assertEqual(list(self.root.glob("*.tmp")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
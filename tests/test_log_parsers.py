@@ -0,0 +1,80 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import _log_index  # noqa: E402
+import _log_parsers  # noqa: E402
+
+
+class LoadParsedTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        self.log_dir = root / "logs"
+        self.log_dir.mkdir()
+        (self.log_dir / "2024-01-01T00-00-00Z_run.log").write_text("outer_ms=1.5\nouter_ms=2.5\n")
+        for target, name, value in (
+            (_log_index, "INDEX_CACHE", root / "index.pkl"),
+            (_log_index, "_index", None),
+            (_log_parsers, "PARSE_CACHE_DIR", root / "parse_cache"),
+        ):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.calls = 0
+
+    def parse(self, path):
+        self.calls += 1
+        return _log_parsers.parse_outer_ms_log(path).tolist()
+
+    def load(self):
+        return [parsed for _, parsed in _log_parsers.load_parsed(self.log_dir, self.parse)]
+
+    def test_unchanged_logs_come_from_cache(self):
+        self.assertEqual(self.load(), [[1.5, 2.5]])
+        self.assertEqual(self.load(), [[1.5, 2.5]])
+        self.assertEqual(self.calls, 1)
+
+    def test_parser_version_change_drops_cache(self):
+        self.load()
+        with mock.patch.object(_log_parsers, "PARSER_VERSION", "changed"):
+            self.assertEqual(self.load(), [[1.5, 2.5]])
+        self.assertEqual(self.calls, 2)
+
+
+class SingleLineMatchTest(unittest.TestCase):
+    """A match must never pair fields from adjacent lines, as the old per-line scan could not."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.log = Path(tmp.name) / "2024-01-01T00-00-00Z_run.log"
+
+    def test_run_log_fields_split_across_lines(self):
+        self.log.write_bytes(
+            b"req=1 http_code=200\nlatency_ns=1000 latency_ms=1.0\n"
+            b"req=2 http_code=200 latency_ns=2000 latency_ms=2.0\n"
+            b"rss_kb=100\ncpu_pct=5.0\n"
+        )
+        parsed = _log_parsers.parse_run_log(str(self.log))
+        self.assertEqual(parsed["latencies_ms"].tolist(), [2.0])
+        self.assertIsNone(parsed["rss_kb"])
+
+    def test_scaling_fields_split_across_lines(self):
+        self.log.write_bytes(
+            b"run=1 conc=2\ntotal_requests=10 elapsed_ms=5 throughput_rps=1.0 total_rss_kb=10 avg_rss_kb=5\n"
+        )
+        self.assertEqual(_log_parsers.parse_scaling_log(str(self.log)), [])
+
+    def test_stateful_latency_on_a_later_line(self):
+        self.log.write_bytes(b"req=1\nfoo latency_ms=9\nreq=2 path=/state latency_ms=3\nreq=3\npath=/x latency_ms=4\n")
+        self.assertEqual(_log_parsers.parse_stateful_log(str(self.log)), [("/state", 3.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()